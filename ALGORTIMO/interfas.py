@@ -3,7 +3,13 @@ import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 from scipy.stats import poisson, expon, norm
-from simulacion_core import GeneradorLCG, GeneradorVariables, PruebasAjuste, MonteCarlo
+from scipy.special import erf, gamma
+from simulacion_core import (GeneradorLCG, GeneradorVariables, PruebasAjuste, MonteCarlo, CacheMuestras,
+                             ExportadorDatos, IngestaDatos, Bootstrap, FAMILIAS_LOTE,
+                             SecuenciaHalton, SecuenciaSobol, MuestreadorAlias, en_bloques)
+import io
+import json
+import os
 import time
 from datetime import datetime
 
@@ -144,7 +150,7 @@ def mostrar_manual():
     **Métodos Implementados:**
     
     #### Prueba Chi-Cuadrado (χ²)
-    - **Aplicación:** Variables discretas.
+    - **Aplicación:** Variables discretas; en continuas, mediante intervalos equiprobables de la distribución teórica.
     - **Hipótesis nula (H₀):** Los datos siguen la distribución teórica esperada.
     - **Criterio de aceptación:** p > 0.05 → Se acepta la hipótesis nula.
     
@@ -236,6 +242,135 @@ if 'historial_resultados' not in st.session_state:
 if 'sesion_activa' not in st.session_state:
     st.session_state.sesion_activa = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
 
+# Presupuesto de la cache de muestras: es unica para todo el proceso, asi que lo fija el servidor
+MEMORIA_CACHE_MB = int(os.environ.get("SIMULACION_MEMORIA_CACHE_MB", 256))
+
+@st.cache_resource
+def obtener_cache_muestras():
+    """Caché de muestras compartida entre reejecuciones y sesiones (solo semillas manuales)."""
+    return CacheMuestras(MEMORIA_CACHE_MB * 2**20)
+
+# Por encima de este tamaño las pruebas se calculan en flujo (memoria acotada)
+UMBRAL_FLUJO = 2_000_000
+
+# La exportación masiva solo escribe dentro de este directorio del servidor
+DIRECTORIO_EXPORTACION = os.environ.get(
+    "SIMULACION_DIR_EXPORTACION",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "exportaciones")
+)
+
+# Lectura de archivos locales del servidor: deshabilitada salvo que se configure
+DIRECTORIO_DATOS = os.environ.get("SIMULACION_DIR_DATOS")
+
+def ruta_datos(nombre):
+    """Ruta real dentro de DIRECTORIO_DATOS; ValueError si apunta fuera de el."""
+    base = os.path.realpath(DIRECTORIO_DATOS)
+    ruta = os.path.realpath(os.path.join(base, nombre.strip()))
+    if os.path.commonpath([base, ruta]) != base:
+        raise ValueError("la ruta esta fuera del directorio de datos configurado")
+    return ruta
+
+def ruta_exportacion(nombre):
+    """Ruta dentro de DIRECTORIO_EXPORTACION (solo el nombre base); None si no es valida o ya existe."""
+    nombre = os.path.basename(nombre.strip())
+    if nombre in ("", ".", ".."):
+        return None
+    destino = os.path.join(DIRECTORIO_EXPORTACION, nombre)
+    if os.path.exists(destino) or os.path.exists(f"{destino}.json"):
+        return None
+    return destino
+
+@st.cache_resource(max_entries=4, show_spinner="Cargando datos del proceso...")
+def cargar_datos(identificador, _fuente):
+    """Ingesta en una sola pasada; el resultado se reutiliza mientras no cambie el archivo."""
+    return IngestaDatos.cargar(_fuente)
+
+# =========================================================
+# CAPA DE GRÁFICOS - AGREGACIÓN EN SERVIDOR Y PNG EN CACHÉ
+# =========================================================
+# Por encima de este número de puntos el diagrama de dispersión se submuestrea
+UMBRAL_DISPERSION = 20_000
+
+def histograma(datos, bins):
+    """Conteos y bordes por bloques (np.histogram), sin pasar el arreglo crudo a matplotlib."""
+    minimo, maximo = float(np.min(datos)), float(np.max(datos))
+    if minimo == maximo:
+        minimo, maximo = minimo - 0.5, maximo + 0.5
+    bordes = np.linspace(minimo, maximo, bins + 1)
+    conteos = np.zeros(bins, dtype=np.int64)
+    for bloque in en_bloques(datos):
+        conteos += np.histogram(bloque, bins=bordes)[0]
+    return conteos, bordes
+
+def estadisticas_caja(datos, max_atipicos=2000):
+    """Estadisticas del diagrama de caja (cuartiles, bigotes de 1.5 RIC y atipicos muestreados)."""
+    datos = np.asarray(datos, dtype=np.float64)
+    q1, mediana, q3 = np.quantile(datos, [0.25, 0.5, 0.75])
+    ric = q3 - q1
+    internos = datos[(datos >= q1 - 1.5 * ric) & (datos <= q3 + 1.5 * ric)]
+    atipicos = datos[(datos < q1 - 1.5 * ric) | (datos > q3 + 1.5 * ric)]
+    atipicos = atipicos[::max(1, -(-len(atipicos) // max_atipicos))]
+    return (float(q1), float(mediana), float(q3), float(internos.min()), float(internos.max()), atipicos)
+
+def a_png(fig):
+    """Rasteriza la figura una sola vez y libera la memoria de matplotlib."""
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", dpi=110, bbox_inches="tight")
+    plt.close(fig)
+    return buffer.getvalue()
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def png_histograma(conteos, bordes, curva_x, curva_y, titulo, etiqueta_curva, ejes=None, tamano=(9, 6)):
+    """Histograma de densidad a partir de conteos ya agregados, con la curva teorica superpuesta."""
+    densidad = conteos / (conteos.sum() * np.diff(bordes))
+    fig, ax = plt.subplots(figsize=tamano)
+    ax.hist(bordes[:-1], bins=bordes, weights=densidad, color='#3498db', edgecolor='#2c3e50', alpha=0.7)
+    ax.plot(curva_x, curva_y, 'r--', lw=2.5, label=etiqueta_curva, color='#e74c3c')
+    ax.set_title(titulo, fontsize=14, fontweight='bold', color='#2c3e50')
+    if ejes:
+        ax.set_xlabel(ejes[0], fontsize=12)
+        ax.set_ylabel(ejes[1], fontsize=12)
+    ax.legend()
+    ax.grid(True, alpha=0.3)
+    ax.set_facecolor('#f8f9fa')
+    return a_png(fig)
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def png_caja(estadisticas):
+    """Diagrama de caja dibujado con ax.bxp desde estadisticas precalculadas."""
+    q1, mediana, q3, bigote_inf, bigote_sup, atipicos = estadisticas
+    fig, ax = plt.subplots(figsize=(9, 6))
+    box_plot = ax.bxp([{'q1': q1, 'med': mediana, 'q3': q3, 'whislo': bigote_inf,
+                        'whishi': bigote_sup, 'fliers': atipicos}], patch_artist=True)
+    box_plot['boxes'][0].set_facecolor('#3498db')
+    box_plot['boxes'][0].set_alpha(0.7)
+    ax.set_ylabel("Rango de Valores", fontsize=12)
+    ax.set_title("Diagrama de Caja - Analisis de Dispersion", 
+                fontsize=14, fontweight='bold', color='#2c3e50')
+    ax.grid(True, alpha=0.3)
+    ax.set_facecolor('#f8f9fa')
+    return a_png(fig)
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def png_dispersion_circulo(puntos_x, puntos_y, dentro):
+    """Puntos dentro/fuera del circulo unitario (ya submuestreados a UMBRAL_DISPERSION)."""
+    fig, ax = plt.subplots(figsize=(7, 7))
+    ax.scatter(puntos_x[dentro], puntos_y[dentro], color="#27ae60", s=1, alpha=0.6, 
+              label="Dentro del circulo")
+    ax.scatter(puntos_x[~dentro], puntos_y[~dentro], color="#e74c3c", s=1, alpha=0.6, 
+              label="Fuera del circulo")
+    circle = plt.Circle((0, 0), 1, color="#2c3e50", fill=False, linewidth=2.5)
+    ax.add_patch(circle)
+    ax.set_aspect('equal')
+    ax.set_xlim(-0.05, 1.05)
+    ax.set_ylim(-0.05, 1.05)
+    ax.set_title("Simulacion Monte Carlo - Distribucion de Puntos", 
+                fontweight='bold', fontsize=13, color='#2c3e50')
+    ax.legend(loc='upper right', fontsize=10, markerscale=8)
+    ax.grid(True, alpha=0.3)
+    ax.set_facecolor('#f8f9fa')
+    return a_png(fig)
+
 # =========================================================
 # CABECERA PRINCIPAL
 # =========================================================
@@ -284,9 +419,18 @@ with st.sidebar:
             help="Valor unico para reproducibilidad en auditorias"
         )
         semilla = int(semilla_input)
+        cache = obtener_cache_muestras()
+        st.caption(f"Cache de muestras: {cache.memoria_usada / 2**20:.0f} de {MEMORIA_CACHE_MB} MB "
+                   f"({len(cache)} entradas)")
     else:
         semilla = int(time.time() * 1000) % 2**32
     
+    motor_vectorizado = st.checkbox(
+        "Motor vectorizado (NumPy)",
+        value=True,
+        help="Desactivar para usar la version escalar didactica del generador"
+    )
+    
     # Display semilla
     with st.container():
         st.markdown("<div class='professional-tab'>", unsafe_allow_html=True)
@@ -326,7 +470,21 @@ except TypeError:
     gen = GeneradorLCG()
     gen.semilla = semilla
 
-var_gen = GeneradorVariables(gen)
+var_gen = GeneradorVariables(gen, vectorizado=motor_vectorizado)
+
+def generar_datos(clave, generar):
+    """Reutiliza la muestra si la semilla es manual; en modo automatico siempre genera."""
+    if "Manual" not in semilla_op:
+        return generar()
+    clave = clave + (semilla, motor_vectorizado, gen.a, gen.c, gen.m)
+    return obtener_cache_muestras().obtener(clave, generar)
+
+def exportar_bytes(datos, formato, metadatos=None):
+    """Serializa los datos en memoria con el mismo escritor del exportador por flujo."""
+    buffer = io.BytesIO()
+    ExportadorDatos.exportar_flujo([np.asarray(datos)], buffer, formato, n=len(datos),
+                                   metadatos=metadatos)
+    return buffer.getvalue()
 
 # =========================================================
 # DASHBOARD PRINCIPAL
@@ -436,7 +594,8 @@ elif "Generacion" in menu:
     with col1:
         tipo = st.selectbox(
             "Seleccione distribucion:",
-            ["Poisson", "Exponencial", "Normal (Box-Muller)"],
+            ["Poisson", "Exponencial", "Exponencial (Ziggurat)",
+             "Normal (Box-Muller)", "Normal (Ziggurat)"],
             help="Seleccione segun el proceso operativo a modelar"
         )
     
@@ -457,9 +616,12 @@ elif "Generacion" in menu:
     
     if "Poisson" in tipo:
         with col1:
-            lam = st.slider("λ (tasa promedio esperada):", 0.1, 10.0, 3.0, 0.1,
-                           help="Ejemplo: 3 clientes por hora en sucursal")
-        datos = var_gen.poisson(lam, int(n))
+            lam = st.number_input("λ (tasa promedio esperada):", min_value=0.1, max_value=1e6,
+                                  value=3.0, step=0.5,
+                                  help="Ejemplo: 3 clientes por hora en sucursal")
+        espec = ("poisson", (lam,), {})
+        datos = generar_datos(("poisson", (lam,), int(n), "auto"),
+                              lambda: var_gen.poisson(lam, int(n)))
         dist, params = poisson, (lam,)
         info = f"**λ = {lam}** | Tasa promedio de eventos"
         
@@ -467,7 +629,10 @@ elif "Generacion" in menu:
         with col1:
             lam = st.slider("λ (tasa de ocurrencia):", 0.1, 5.0, 1.5, 0.1,
                            help="Ejemplo: 1.5 transacciones por minuto")
-        datos = var_gen.exponencial(lam, int(n))
+        metodo = "ziggurat" if "Ziggurat" in tipo else "inversa"
+        espec = ("exponencial", (lam,), {"metodo": metodo})
+        datos = generar_datos(("exponencial", (lam,), int(n), metodo),
+                              lambda: var_gen.exponencial(lam, int(n), metodo=metodo))
         dist, params = expon, (0, 1/lam)
         info = f"**λ = {lam}** | Tiempo promedio = {1/lam:.3f} unidades"
         
@@ -478,7 +643,10 @@ elif "Generacion" in menu:
         with col2:
             sigma = st.number_input("σ (Variabilidad del proceso):", min_value=0.1, value=1.0, step=0.1,
                                    help="Medida de dispersion del proceso")
-        datos = var_gen.normal(mu, sigma, int(n))
+        metodo = "ziggurat" if "Ziggurat" in tipo else "box-muller"
+        espec = ("normal", (mu, sigma), {"metodo": metodo})
+        datos = generar_datos(("normal", (mu, sigma), int(n), metodo),
+                              lambda: var_gen.normal(mu, sigma, int(n), metodo=metodo))
         dist, params = norm, (mu, sigma)
         info = f"**μ = {mu}** | **σ = {sigma}** | Proceso centralizado"
     
@@ -511,45 +679,35 @@ elif "Generacion" in menu:
     
     with col1:
         st.markdown("<h4>Distribucion Muestral vs Teorica</h4>", unsafe_allow_html=True)
-        fig, ax = plt.subplots(figsize=(9, 6))
-        ax.hist(datos, bins=40, color='#3498db', edgecolor='#2c3e50', density=True, alpha=0.7)
-        x = np.linspace(min(datos), max(datos), 200)
+        conteos, bordes = histograma(datos, 40)
+        x = np.linspace(bordes[0], bordes[-1], 200)
         try:
             y = dist.pdf(x, *params)
         except AttributeError:
             y = dist.pmf(np.round(x), *params)
-        ax.plot(x, y, 'r--', lw=2.5, label="Distribucion Teorica", color='#e74c3c')
-        ax.set_title(f"Analisis de Distribucion: {tipo.split('(')[0].strip()}", 
-                    fontsize=14, fontweight='bold', color='#2c3e50')
-        ax.set_xlabel("Valores del Proceso", fontsize=12)
-        ax.set_ylabel("Densidad de Probabilidad", fontsize=12)
-        ax.legend()
-        ax.grid(True, alpha=0.3)
-        ax.set_facecolor('#f8f9fa')
-        st.pyplot(fig, use_container_width=True)
+        st.image(png_histograma(conteos, bordes, x, y,
+                                f"Analisis de Distribucion: {tipo.split('(')[0].strip()}",
+                                "Distribucion Teorica",
+                                ejes=("Valores del Proceso", "Densidad de Probabilidad")),
+                 use_container_width=True)
     
     with col2:
         st.markdown("<h4>Analisis de Variabilidad</h4>", unsafe_allow_html=True)
-        fig, ax = plt.subplots(figsize=(9, 6))
-        box_plot = ax.boxplot(datos, vert=True, patch_artist=True)
-        box_plot['boxes'][0].set_facecolor('#3498db')
-        box_plot['boxes'][0].set_alpha(0.7)
-        ax.set_ylabel("Rango de Valores", fontsize=12)
-        ax.set_title("Diagrama de Caja - Analisis de Dispersion", 
-                    fontsize=14, fontweight='bold', color='#2c3e50')
-        ax.grid(True, alpha=0.3)
-        ax.set_facecolor('#f8f9fa')
-        st.pyplot(fig, use_container_width=True)
+        st.image(png_caja(estadisticas_caja(datos)), use_container_width=True)
     
     st.markdown("---")
     
     # Descargas
     st.markdown("<h3>Exportacion de Datos</h3>", unsafe_allow_html=True)
     
+    formatos_disponibles = ExportadorDatos.formatos_disponibles()
+    metadatos = ExportadorDatos.metadatos(espec[0], espec[1], int(n), GeneradorLCG(semilla),
+                                          tamano_bloque=int(n), vectorizado=motor_vectorizado,
+                                          **espec[2])
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        csv_data = pd.DataFrame(datos, columns=["Valor_Simulado"]).to_csv(index=False)
+        csv_data = exportar_bytes(datos, "csv")
         st.download_button(
             "Descargar CSV",
             data=csv_data,
@@ -559,7 +717,7 @@ elif "Generacion" in menu:
         )
     
     with col2:
-        txt_data = "\n".join(map(str, datos))
+        txt_data = exportar_bytes(datos, "txt")
         st.download_button(
             "Descargar TXT para Analisis",
             data=txt_data,
@@ -569,12 +727,70 @@ elif "Generacion" in menu:
         )
     
     with col3:
-        st.markdown("""
-        <div class="success-box">
-        <strong>Datos Listos</strong><br>
-        Formatos disponibles para integracion con sistemas empresariales
-        </div>
-        """, unsafe_allow_html=True)
+        # Parquet/Feather llevan los metadatos embebidos; se prefieren si pyarrow esta disponible
+        binarios = [f for f in formatos_disponibles if f in ExportadorDatos.FORMATOS_BINARIOS]
+        formato_binario = st.selectbox("Formato binario:", binarios,
+                                       index=binarios.index("parquet") if "parquet" in binarios else 0,
+                                       label_visibility="collapsed")
+        nombre_binario = f"datos_{tipo.split()[0].lower()}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{formato_binario}"
+        st.download_button(
+            f"Descargar {formato_binario.upper()}",
+            data=exportar_bytes(datos, formato_binario, metadatos),
+            file_name=nombre_binario,
+            mime="application/octet-stream",
+            use_container_width=True
+        )
+        if formato_binario == "npy":
+            st.caption("El formato .npy no embebe metadatos: descargue el JSON de auditoria "
+                       "y guardelo junto al archivo")
+            st.download_button(
+                "Descargar metadatos (JSON)",
+                data=json.dumps(metadatos, indent=2),
+                file_name=f"{nombre_binario}.json",
+                mime="application/json",
+                use_container_width=True
+            )
+    
+    st.markdown("""
+    <div class="success-box">
+    <strong>Datos Listos</strong><br>
+    Formatos disponibles para integracion con sistemas empresariales
+    (Parquet y Feather incluyen metadatos de auditoria: distribucion, parametros, semilla y constantes del LCG)
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # Exportación por flujo para volúmenes grandes (memoria constante)
+    with st.expander("Exportacion Masiva (Streaming)"):
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            n_masivo = st.number_input("Registros a generar:", min_value=1000, max_value=10**9,
+                                       value=10**6, step=10**6)
+        with col2:
+            formato_masivo = st.selectbox("Formato:", formatos_disponibles)
+        with col3:
+            nombre_masivo = st.text_input(
+                "Archivo de salida:",
+                value=f"datos_{espec[0]}_{datetime.now().strftime('%Y%m%d')}.{formato_masivo}",
+                help=f"Se guarda en {DIRECTORIO_EXPORTACION}; no se sobrescriben archivos existentes"
+            )
+        if st.button("Generar y Exportar", use_container_width=True):
+            ruta_masiva = ruta_exportacion(nombre_masivo)
+            if ruta_masiva is None:
+                st.error("Nombre de archivo no valido o ya existente en el directorio de exportacion")
+            else:
+                os.makedirs(DIRECTORIO_EXPORTACION, exist_ok=True)
+                barra = st.progress(0)
+                lcg_flujo = GeneradorLCG(semilla)
+                metadatos_flujo = ExportadorDatos.metadatos(espec[0], espec[1], int(n_masivo), lcg_flujo,
+                                                            **espec[2])
+                resumen = ExportadorDatos.exportar_flujo(
+                    GeneradorVariables(lcg_flujo).bloques(espec[0], espec[1], int(n_masivo), **espec[2]),
+                    ruta_masiva, formato_masivo, n=int(n_masivo), progreso=barra.progress,
+                    metadatos=metadatos_flujo
+                )
+                st.success(f"{resumen['registros']:,} registros escritos en {ruta_masiva} "
+                           f"({resumen['bytes'] / 2**20:.1f} MB, "
+                           f"{resumen['registros_por_segundo']:,.0f} registros/s)")
     
     # Guardar en historial
     st.session_state.historial_resultados.append({
@@ -606,19 +822,38 @@ elif "Pruebas" in menu:
     """, unsafe_allow_html=True)
     
     archivo = st.file_uploader(
-        "Cargar Datos (TXT o CSV):",
-        type=["txt", "csv"],
+        "Cargar Datos (TXT, CSV, NPY, Parquet o Feather):",
+        type=["txt", "csv", "npy", "parquet", "feather"],
         help="Archivo con datos numericos del proceso a validar"
     )
+    ruta_local = ""
+    if DIRECTORIO_DATOS:
+        ruta_local = st.text_input(
+            "O archivo del directorio de datos del servidor (archivos de varios GB):",
+            help=f"Relativo a {DIRECTORIO_DATOS}; se lee por bloques y, si excede la memoria, "
+                 "se mapea desde disco"
+        )
     
-    if archivo:
+    if archivo or ruta_local:
         try:
-            datos = np.loadtxt(archivo)
-        except:
-            df = pd.read_csv(archivo)
-            datos = df.iloc[:, 0].values
+            if archivo:
+                identificador = (archivo.name, archivo.size, getattr(archivo, "file_id", None))
+                datos, informe = cargar_datos(identificador, archivo)
+            else:
+                ruta_local = ruta_datos(ruta_local)
+                identificador = (ruta_local, os.path.getmtime(ruta_local))
+                datos, informe = cargar_datos(identificador, ruta_local)
+        except (OSError, ValueError) as exc:
+            st.error(f"No se pudo leer el archivo: {exc}")
+            st.stop()
         
         st.success(f"Archivo cargado: {len(datos)} registros de proceso")
+        st.caption(f"Formato {informe['formato'].upper()} | {informe['mb_por_segundo']:.1f} MB/s | "
+                   f"{informe['registros_por_segundo']:,.0f} registros/s"
+                   + (" | mapeado en memoria" if informe['mapeado'] else ""))
+        if informe['metadatos']:
+            with st.expander("Metadatos de Auditoria"):
+                st.json(informe['metadatos'])
         
         col1, col2 = st.columns(2)
         
@@ -637,11 +872,16 @@ elif "Pruebas" in menu:
         
         st.markdown("---")
         
-        # Realizar prueba
+        # Realizar prueba (en flujo para conjuntos muy grandes)
+        en_flujo = len(datos) > UMBRAL_FLUJO
+        error_d = 0.0
         if "Poisson" in dist_sel:
             lam = np.mean(datos)
             dist, params = poisson, (lam,)
-            chi2_stat, gl, p_val = PruebasAjuste.chi_cuadrado(datos, dist, params)
+            if en_flujo:
+                chi2_stat, gl, p_val = PruebasAjuste.chi_cuadrado_flujo(en_bloques(datos), dist, params)
+            else:
+                chi2_stat, gl, p_val = PruebasAjuste.chi_cuadrado(datos, dist, params)
             
             col1, col2, col3, col4 = st.columns(4)
             with col1:
@@ -658,21 +898,37 @@ elif "Pruebas" in menu:
         elif "Exponencial" in dist_sel:
             lam = 1 / np.mean(datos)
             dist, params = expon, (0, 1/lam)
-            d_stat, p_val = PruebasAjuste.kolmogorov_smirnov(datos, dist, params)
+            if "Chi" in prueba_tipo:
+                chi2_stat, gl, p_val = PruebasAjuste.chi_cuadrado_agrupado(datos, dist, params, estimados=1)
+            elif en_flujo:
+                d_stat, p_val, error_d = PruebasAjuste.kolmogorov_smirnov_flujo(en_bloques(datos), dist, params)
+            else:
+                d_stat, p_val = PruebasAjuste.kolmogorov_smirnov(datos, dist, params)
             
             col1, col2, col3 = st.columns(3)
             with col1:
                 st.metric("λ Estimado", f"{lam:.4f}")
             with col2:
-                st.metric("Estadistico D", f"{d_stat:.4f}")
+                if "Chi" in prueba_tipo:
+                    st.metric("Estadistico χ²", f"{chi2_stat:.4f}", delta=f"{gl} g.l.", delta_color="off")
+                else:
+                    st.metric("Estadistico D", f"{d_stat:.4f}")
             with col3:
                 st.metric("Valor p", f"{p_val:.4f}", 
                          delta="Conforme" if p_val > 0.05 else "No Conforme")
         
         else:
-            mu, sigma = np.mean(datos), np.std(datos)
+            if en_flujo:
+                mu, sigma = PruebasAjuste.media_desviacion(datos)
+            else:
+                mu, sigma = np.mean(datos), np.std(datos)
             dist, params = norm, (mu, sigma)
-            d_stat, p_val = PruebasAjuste.kolmogorov_smirnov(datos, dist, params)
+            if "Chi" in prueba_tipo:
+                chi2_stat, gl, p_val = PruebasAjuste.chi_cuadrado_agrupado(datos, dist, params, estimados=2)
+            elif en_flujo:
+                d_stat, p_val, error_d = PruebasAjuste.kolmogorov_smirnov_flujo(en_bloques(datos), dist, params)
+            else:
+                d_stat, p_val = PruebasAjuste.kolmogorov_smirnov(datos, dist, params)
             
             col1, col2, col3, col4 = st.columns(4)
             with col1:
@@ -680,11 +936,38 @@ elif "Pruebas" in menu:
             with col2:
                 st.metric("Desv.Est. (σ)", f"{sigma:.4f}")
             with col3:
-                st.metric("Estadistico D", f"{d_stat:.4f}")
+                if "Chi" in prueba_tipo:
+                    st.metric("Estadistico χ²", f"{chi2_stat:.4f}", delta=f"{gl} g.l.", delta_color="off")
+                else:
+                    st.metric("Estadistico D", f"{d_stat:.4f}")
             with col4:
                 st.metric("Valor p", f"{p_val:.4f}", 
                          delta="Conforme" if p_val > 0.05 else "No Conforme")
         
+        if "Poisson" not in dist_sel and "Chi" not in prueba_tipo:
+            with st.expander("Valor p por Bootstrap Parametrico (Lilliefors)"):
+                col1, col2 = st.columns(2)
+                with col1:
+                    replicas_boot = st.number_input("Replicas bootstrap (B):", min_value=100,
+                                                    max_value=100000, value=1000, step=100)
+                with col2:
+                    procesos_boot = st.number_input("Procesos paralelos:", min_value=1,
+                                                    max_value=os.cpu_count() or 1, value=1, step=1,
+                                                    key="procesos_bootstrap")
+                if st.button("Calcular valor p bootstrap", use_container_width=True):
+                    familia = "exponencial" if "Exponencial" in dist_sel else "normal"
+                    _, p_val, error_p = PruebasAjuste.ks_bootstrap(
+                        datos, familia, GeneradorLCG(semilla), B=int(replicas_boot),
+                        procesos=int(procesos_boot))
+                    st.metric("Valor p Bootstrap", f"{p_val:.4f}", delta=f"± {error_p:.4f} (error MC)",
+                              delta_color="off")
+                    st.caption("El dictamen se emite con el valor p bootstrap, que corrige la "
+                               "estimacion de parametros con los mismos datos.")
+        
+        if en_flujo:
+            st.caption(f"Prueba calculada en flujo sobre {len(datos):,} registros"
+                       + (f" | error maximo del estadistico D: {error_d:.1e}" if error_d else ""))
+        
         st.markdown("---")
         
         # Interpretación
@@ -708,20 +991,106 @@ elif "Pruebas" in menu:
             """, unsafe_allow_html=True)
         
         # Gráfico de validación
-        fig, ax = plt.subplots(figsize=(11, 6))
-        ax.hist(datos, bins=30, density=True, color='#3498db', edgecolor='#2c3e50', alpha=0.7)
-        x = np.linspace(min(datos), max(datos), 200)
+        conteos, bordes = histograma(datos, 30)
+        x = np.linspace(bordes[0], bordes[-1], 200)
         try:
             y = dist.pdf(x, *params)
         except AttributeError:
             y = dist.pmf(np.round(x), *params)
-        ax.plot(x, y, 'r--', lw=2.5, label="Distribucion Teorica de Referencia", color='#e74c3c')
-        ax.set_title(f"Validacion: {dist_sel} | Valor p = {p_val:.4f}", 
-                    fontweight='bold', fontsize=14, color='#2c3e50')
-        ax.legend()
-        ax.grid(True, alpha=0.3)
-        ax.set_facecolor('#f8f9fa')
-        st.pyplot(fig, use_container_width=True)
+        st.image(png_histograma(conteos, bordes, x, y, f"Validacion: {dist_sel} | Valor p = {p_val:.4f}",
+                                "Distribucion Teorica de Referencia", tamano=(11, 6)),
+                 use_container_width=True)
+        
+        # Remuestreo desde la distribución empírica cargada
+        with st.expander("Remuestreo Empirico (Metodo de Alias)"):
+            n_emp = st.number_input("Muestras a generar:", min_value=10, max_value=10000000,
+                                    value=10000, step=1000)
+            if st.button("Generar desde distribucion empirica", use_container_width=True):
+                empirica = MuestreadorAlias.desde_datos(datos)
+                muestra = empirica.muestrear(int(n_emp), var_gen.generador)
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    st.metric("Media Empirica", f"{np.mean(datos):.4f}")
+                with col2:
+                    st.metric("Media Remuestreada", f"{np.mean(muestra):.4f}")
+                with col3:
+                    st.metric("Valores Distintos", len(empirica.valores))
+        
+        # Intervalos de confianza bootstrap no paramétricos
+        with st.expander("Intervalos de Confianza Bootstrap"):
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                estadistico_boot = st.selectbox("Estadistico:", Bootstrap.ESTADISTICOS)
+            with col2:
+                q_boot = st.slider("Cuantil (q):", 0.01, 0.99, 0.9, 0.01,
+                                   disabled=estadistico_boot != "cuantil")
+            with col3:
+                replicas_ic = st.number_input("Replicas (B):", min_value=200, max_value=100000,
+                                              value=2000, step=200)
+            with col4:
+                nivel_ic = st.selectbox("Nivel de confianza:", [0.90, 0.95, 0.99], index=1)
+            procesos_ic = st.number_input("Procesos paralelos:", min_value=1,
+                                          max_value=os.cpu_count() or 1, value=1, step=1,
+                                          key="procesos_ic")
+            if st.button("Calcular intervalos", use_container_width=True):
+                resultado = Bootstrap.intervalo(datos, estadistico_boot, GeneradorLCG(semilla),
+                                                B=int(replicas_ic), nivel=nivel_ic,
+                                                procesos=int(procesos_ic), q=q_boot)
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    st.metric("Estimacion", f"{resultado['estimacion']:.4f}")
+                with col2:
+                    st.metric("Error Estandar", f"{resultado['error_estandar']:.4f}")
+                with col3:
+                    st.metric("Sesgo Bootstrap", f"{resultado['sesgo']:.4f}")
+                st.dataframe(pd.DataFrame(
+                    [{'Metodo': metodo.upper(), 'Limite Inferior': f"{inf:.4f}", 'Limite Superior': f"{sup:.4f}"}
+                     for metodo, (inf, sup) in resultado['intervalos'].items()]
+                ), use_container_width=True)
+
+    # Evaluación por lotes: varios archivos contra varias familias candidatas
+    st.markdown("---")
+    with st.expander("Evaluacion por Lotes (Multiples Archivos)"):
+        archivos_lote = st.file_uploader(
+            "Cargar conjuntos de datos:",
+            type=["txt", "csv", "npy", "parquet", "feather"],
+            accept_multiple_files=True,
+            key="archivos_lote"
+        )
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            familias_lote = st.multiselect("Familias candidatas:", list(FAMILIAS_LOTE),
+                                           default=list(FAMILIAS_LOTE))
+        with col2:
+            procesos_lote = st.number_input("Procesos paralelos:", min_value=1,
+                                            max_value=os.cpu_count() or 1, value=1, step=1,
+                                            key="procesos_lote")
+        if archivos_lote and familias_lote and st.button("Evaluar lote", use_container_width=True):
+            conjuntos = {}
+            for archivo_lote in archivos_lote:
+                try:
+                    identificador = (archivo_lote.name, archivo_lote.size,
+                                     getattr(archivo_lote, "file_id", None))
+                    conjuntos[archivo_lote.name] = cargar_datos(identificador, archivo_lote)[0]
+                except (OSError, ValueError) as exc:
+                    st.warning(f"{archivo_lote.name}: no se pudo leer ({exc})")
+            if conjuntos:
+                tabla = pd.DataFrame(PruebasAjuste.evaluar_lote(conjuntos, familias_lote,
+                                                                procesos=int(procesos_lote)))
+                evaluados = set(tabla['conjunto']) if len(tabla) else set()
+                for nombre in conjuntos:
+                    if nombre not in evaluados:
+                        st.warning(f"{nombre}: sin valores validos o sin familias aplicables; se omite")
+                if len(tabla):
+                    mejores = tabla[tabla['rango'] == 1]
+                    st.dataframe(pd.DataFrame({
+                        'Conjunto': mejores['conjunto'],
+                        'Mejor Ajuste (AIC)': mejores['familia'].str.upper(),
+                        'Valor p': mejores['valor_p'].map(lambda v: f"{v:.4f}"),
+                        'Dictamen': np.where(mejores['conforme'], "CONFORME", "NO CONFORME"),
+                    }), use_container_width=True)
+                    st.dataframe(tabla.assign(parametros=tabla['parametros'].map(
+                        lambda ps: ", ".join(f"{v:.4g}" for v in ps))), use_container_width=True)
 
 # =========================================================
 # MONTE CARLO
@@ -736,13 +1105,13 @@ elif "Monte Carlo" in menu:
     </div>
     """, unsafe_allow_html=True)
     
-    col1, col2 = st.columns(2)
-    
+    col1, col2, col3 = st.columns(3)
+
     with col1:
         n = st.number_input(
             "Escala de Simulacion (numero de puntos):",
             min_value=100,
-            max_value=500000,
+            max_value=100_000_000,
             value=10000,
             step=1000,
             help="Cantidad de escenarios simulados para estimar el valor de π"
@@ -754,9 +1123,39 @@ elif "Monte Carlo" in menu:
             min_value=1,
             max_value=10,
             value=5,
-            help="Control de la resolucion visual del grafico"
+            help="Resolucion de la traza de convergencia (50 puntos por nivel)"
         )
-    
+
+    with col3:
+        procesos = st.number_input(
+            "Procesos Paralelos:",
+            min_value=1,
+            max_value=os.cpu_count() or 1,
+            value=1,
+            step=1,
+            help="Nucleos utilizados en la simulacion; el resultado es identico al serial"
+        )
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        replicas_barrido = st.number_input(
+            "Replicas por Escala (Analisis de Precision):",
+            min_value=1,
+            max_value=200,
+            value=10,
+            step=1,
+            help="Simulaciones independientes por escala para estimar error medio y dispersion"
+        )
+
+    with col2:
+        barrido_anidado = st.checkbox(
+            "Reutilizar prefijos (barrido anidado)",
+            value=True,
+            help="Cada replica simula solo la mayor escala y lee las menores de sus prefijos; "
+                 "desactivelo si necesita independencia entre escalas"
+        )
+
     col1, col2, col3 = st.columns(3)
     
     with col1:
@@ -777,7 +1176,9 @@ elif "Monte Carlo" in menu:
         """, unsafe_allow_html=True)
 
     if boton_ejecutar:
-        pi_est = MonteCarlo.estimar_pi(int(n), gen)
+        simulacion = MonteCarlo.simular_pi(int(n), gen, max_retenidos=100_000,
+                                           resolucion=50 * precision, procesos=int(procesos))
+        pi_est = simulacion['estimacion']
         error = abs(np.pi - pi_est)
         error_relativo = (error / np.pi) * 100
         
@@ -793,53 +1194,31 @@ elif "Monte Carlo" in menu:
         
         st.markdown("---")
         
-        # Generar puntos para visualización
-        puntos_x = np.array([gen.siguiente() for _ in range(int(n))])
-        puntos_y = np.array([gen.siguiente() for _ in range(int(n))])
-        dentro = puntos_x**2 + puntos_y**2 <= 1
+        # Puntos de la misma simulación (vista a paso fijo si n es grande)
+        paso_grafico = max(1, -(-len(simulacion['x']) // UMBRAL_DISPERSION))
+        puntos_x = simulacion['x'][::paso_grafico]
+        puntos_y = simulacion['y'][::paso_grafico]
+        dentro = simulacion['dentro'][::paso_grafico]
+        if simulacion['paso'] * paso_grafico > 1:
+            st.caption(f"Se grafica 1 de cada {simulacion['paso'] * paso_grafico:,} puntos simulados")
         
         # Visualización
         col1, col2 = st.columns(2)
         
         with col1:
-            fig, ax = plt.subplots(figsize=(7, 7))
-            ax.scatter(puntos_x[dentro], puntos_y[dentro], color="#27ae60", s=1, alpha=0.6, 
-                      label="Dentro del circulo")
-            ax.scatter(puntos_x[~dentro], puntos_y[~dentro], color="#e74c3c", s=1, alpha=0.6, 
-                      label="Fuera del circulo")
-            circle = plt.Circle((0, 0), 1, color="#2c3e50", fill=False, linewidth=2.5)
-            ax.add_patch(circle)
-            ax.set_aspect('equal')
-            ax.set_xlim(-0.05, 1.05)
-            ax.set_ylim(-0.05, 1.05)
-            ax.set_title("Simulacion Monte Carlo - Distribucion de Puntos", 
-                        fontweight='bold', fontsize=13, color='#2c3e50')
-            ax.legend(loc='upper right', fontsize=10)
-            ax.grid(True, alpha=0.3)
-            ax.set_facecolor('#f8f9fa')
-            st.pyplot(fig, use_container_width=True)
+            st.image(png_dispersion_circulo(puntos_x, puntos_y, dentro), use_container_width=True)
         
         with col2:
-            # Gráfico de convergencia - CORREGIDO
+            # Gráfico de convergencia: traza acumulada con banda de confianza
             fig, ax = plt.subplots(figsize=(7, 7))
+            traza = simulacion['traza']
             
-            # Calcular convergencia para análisis
-            paso = max(1, n // 100)
-            puntos_parciales = np.arange(paso, n + 1, paso)
-            pi_convergencia = []
-            
-            for np_actual in puntos_parciales:
-                dentro_parcial = np.sum((puntos_x[:np_actual]**2 + puntos_y[:np_actual]**2) <= 1)
-                pi_est_parcial = 4 * dentro_parcial / np_actual
-                pi_convergencia.append(pi_est_parcial)
-            
-            # Línea corregida - eliminado el color duplicado
-            ax.plot(puntos_parciales, pi_convergencia, linewidth=2.5, 
+            ax.plot(traza['n'], traza['estimacion'], linewidth=2.5, 
                    label="π Estimado", color='#3498db')
             ax.axhline(y=np.pi, linestyle='--', linewidth=2.5, 
                       label="π Real", color='#e74c3c')
-            ax.fill_between(puntos_parciales, np.pi - 0.1, np.pi + 0.1, 
-                          alpha=0.2, color='#27ae60', label="Banda de ±0.1")
+            ax.fill_between(traza['n'], traza['ic_inf'], traza['ic_sup'], 
+                          alpha=0.2, color='#27ae60', label="IC 95%")
             ax.set_xlabel("Escala de Simulacion (puntos)", fontsize=11)
             ax.set_ylabel("Valor Estimado de π", fontsize=11)
             ax.set_title("Convergencia del Metodo - Analisis de Estabilidad", 
@@ -853,41 +1232,51 @@ elif "Monte Carlo" in menu:
         st.markdown("### Analisis de Precision vs Escala")
         
         valores_n = [100, 500, 1000, 5000, 10000, 50000, 100000]
-        resultados = []
         
         progress_bar = st.progress(0)
         status_text = st.empty()
         
-        for idx, n_test in enumerate(valores_n):
-            status_text.text(f"Ejecutando simulacion con {n_test:,} puntos...")
-            pi_test = MonteCarlo.estimar_pi(n_test, gen)
-            error = abs(np.pi - pi_test)
+        def informar(fraccion):
+            progress_bar.progress(fraccion)
+            status_text.text(f"Ejecutando simulaciones... {fraccion:.0%}")
+        
+        barrido = MonteCarlo.barrido_precision(valores_n, int(replicas_barrido), gen,
+                                               procesos=int(procesos), progreso=informar,
+                                               anidado=barrido_anidado)
+        status_text.text("Analisis completado")
+        
+        resultados = []
+        for n_test, pi_test, error, desviacion in zip(barrido['n'], barrido['estimacion_media'],
+                                                      barrido['error_medio'], barrido['desviacion']):
             error_rel = (error / np.pi) * 100
             resultados.append({
                 'Escala': f"{n_test:,}",
-                'π Estimado': f"{pi_test:.6f}",
-                'Error Absoluto': f"{error:.6f}",
+                'π Estimado (media)': f"{pi_test:.6f}",
+                'Error Absoluto Medio': f"{error:.6f}",
+                'Desviacion Estandar': f"{desviacion:.6f}",
                 'Error Relativo': f"{error_rel:.4f}%",
                 'Precision': 'Alta' if error_rel < 1 else 'Media' if error_rel < 5 else 'Baja'
             })
-            progress_bar.progress((idx + 1) / len(valores_n))
-        
-        status_text.text("Analisis completado")
         
         df_resultados = pd.DataFrame(resultados)
         st.dataframe(df_resultados, use_container_width=True)
+        st.metric("Tasa de Convergencia Empirica", f"{barrido['tasa_convergencia']:.3f}",
+                  help="Pendiente log-log del error medio; el valor teorico es -0.5")
         
-        # Gráfico ejecutivo de error vs escala
+        # Gráfico ejecutivo de error vs escala (mismas simulaciones que la tabla)
         fig, ax = plt.subplots(figsize=(12, 6))
-        errores = [abs(np.pi - MonteCarlo.estimar_pi(n_val, gen)) for n_val in valores_n]
-        ax.plot(valores_n, errores, 'o-', linewidth=2.5, markersize=10, color='#3498db', 
-               markerfacecolor='#2980b9')
+        ax.errorbar(barrido['n'], barrido['error_medio'], yerr=barrido['desviacion'], fmt='o-',
+                    linewidth=2.5, markersize=10, color='#3498db', markerfacecolor='#2980b9',
+                    capsize=5, label="Error absoluto medio ± desviacion")
+        ax.plot(barrido['n'], barrido['error_medio'][0] * np.sqrt(barrido['n'][0] / barrido['n']), '--',
+                color='#7f8c8d', label="Referencia O(1/√n)")
         ax.set_xlabel("Escala de Simulacion (puntos - escala logaritmica)", fontsize=12)
         ax.set_ylabel("Error Absoluto (escala logaritmica)", fontsize=12)
         ax.set_title("Relacion: Precision vs Escala de Simulacion", 
                     fontweight='bold', fontsize=14, color='#2c3e50')
         ax.set_xscale('log')
         ax.set_yscale('log')
+        ax.legend()
         ax.grid(True, alpha=0.3)
         ax.set_facecolor('#f8f9fa')
         st.pyplot(fig, use_container_width=True)
@@ -904,6 +1293,132 @@ elif "Monte Carlo" in menu:
         </div>
         """, unsafe_allow_html=True)
 
+    # Cuasi-Monte Carlo: error del LCG frente a Halton y Sobol con los mismos puntos
+    with st.expander("Comparacion LCG vs Cuasi-Monte Carlo (Halton / Sobol)"):
+        if st.button("Comparar secuencias", use_container_width=True):
+            escalas = 2 ** np.arange(4, int(np.log2(min(n, 2**20))) + 1)
+            fuentes = {
+                "LCG": gen,
+                "Halton": SecuenciaHalton(2, semilla=semilla),
+                "Sobol": SecuenciaSobol(2, semilla=semilla),
+            }
+            colores = {"LCG": '#e74c3c', "Halton": '#27ae60', "Sobol": '#3498db'}
+            fig, ax = plt.subplots(figsize=(12, 6))
+            filas = []
+            for nombre, fuente in fuentes.items():
+                u = fuente.siguientes(2 * escalas[-1])
+                aciertos = np.cumsum(u[0::2]**2 + u[1::2]**2 <= 1)
+                errores = np.abs(4 * aciertos[escalas - 1] / escalas - np.pi)
+                ax.plot(escalas, errores, 'o-', linewidth=2, markersize=6, label=nombre,
+                        color=colores[nombre])
+                filas.append({'Fuente': nombre, 'Puntos': f"{escalas[-1]:,}",
+                              'Error Absoluto': f"{errores[-1]:.2e}"})
+            ax.plot(escalas, 1.64 / np.sqrt(escalas), ':', color='#7f8c8d', label="Referencia O(1/√n)")
+            ax.set_xscale('log', base=2)
+            ax.set_yscale('log')
+            ax.set_xlabel("Puntos (escala logaritmica)", fontsize=12)
+            ax.set_ylabel("Error Absoluto", fontsize=12)
+            ax.set_title("Error de Estimacion de π por Fuente de Puntos",
+                         fontweight='bold', fontsize=14, color='#2c3e50')
+            ax.legend()
+            ax.grid(True, alpha=0.3)
+            ax.set_facecolor('#f8f9fa')
+            st.pyplot(fig, use_container_width=True)
+            st.dataframe(pd.DataFrame(filas), use_container_width=True)
+
+    # Motor general: integrales en cajas d-dimensionales y probabilidades de eventos
+    with st.expander("Motor General de Integracion y Riesgo"):
+        caso = st.selectbox("Caso de analisis:", [
+            "Integral Gaussiana exp(-|x|²) en [0,1]^d",
+            "Volumen de la esfera unitaria en [-1,1]^d",
+            "Riesgo: P(T₁ + T₂ > t) con tiempos Exponenciales(λ)",
+        ])
+        col1, col2 = st.columns(2)
+        if "Riesgo" in caso:
+            with col1:
+                lam_riesgo = st.number_input("λ (tasa de servicio):", min_value=0.1, value=2.0, step=0.1)
+            with col2:
+                t_riesgo = st.number_input("t (tiempo limite):", min_value=0.1, value=1.0, step=0.1)
+        else:
+            with col1:
+                dimension = st.slider("Dimension (d):", 1, 10, 3)
+        if st.button("Ejecutar motor general", use_container_width=True):
+            if "Gaussiana" in caso:
+                resultado = MonteCarlo.integrar(lambda x: np.exp(-np.sum(x**2, axis=1)),
+                                                [0.0] * dimension, [1.0] * dimension, int(n), gen)
+                exacto = (np.sqrt(np.pi) / 2 * erf(1)) ** dimension
+            elif "esfera" in caso:
+                resultado = MonteCarlo.integrar(lambda x: np.sum(x**2, axis=1) <= 1,
+                                                [-1.0] * dimension, [1.0] * dimension, int(n), gen)
+                exacto = np.pi ** (dimension / 2) / gamma(dimension / 2 + 1)
+            else:
+                resultado = MonteCarlo.probabilidad(
+                    lambda v: v["T1"] + v["T2"] > t_riesgo,
+                    {"T1": ("exponencial", (lam_riesgo,)), "T2": ("exponencial", (lam_riesgo,))},
+                    int(n), gen)
+                exacto = np.exp(-lam_riesgo * t_riesgo) * (1 + lam_riesgo * t_riesgo)
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                st.metric("Estimacion", f"{resultado['estimacion']:.6f}")
+            with col2:
+                st.metric("Error Estandar", f"{resultado['error_estandar']:.2e}")
+            with col3:
+                st.metric("Valor Exacto", f"{exacto:.6f}")
+            with col4:
+                st.metric("Rendimiento", f"{resultado['evaluaciones_por_segundo']:,.0f} eval/s")
+
+    # Reducción de varianza: mismo presupuesto de uniformes, menor error
+    with st.expander("Reduccion de Varianza"):
+        metodos_rv = st.multiselect("Estimadores a comparar:", list(MonteCarlo.METODOS_REDUCCION),
+                                    default=list(MonteCarlo.METODOS_REDUCCION))
+        if metodos_rv and st.button("Comparar estimadores", use_container_width=True):
+            filas = []
+            n_rv = min(int(n), 2_000_000)
+            for metodo in metodos_rv:
+                resultado = MonteCarlo.estimar_pi_reducido(n_rv, gen, metodo)
+                filas.append({
+                    'Metodo': metodo.replace("_", " ").title(),
+                    'π Estimado': f"{resultado['estimacion']:.8f}",
+                    'Error Estandar': f"{resultado['error_estandar']:.2e}",
+                    'Error Absoluto': f"{abs(np.pi - resultado['estimacion']):.2e}",
+                    'Factor de Reduccion': f"{resultado['factor_reduccion']:,.1f}x"
+                })
+            st.dataframe(pd.DataFrame(filas), use_container_width=True)
+            st.caption(f"Todos los estimadores consumen {2 * n_rv:,} uniformes; el factor compara "
+                       "su varianza con la del acierto/fallo al mismo costo.")
+
+    # Simulación adaptativa: se detiene al alcanzar la precisión pedida
+    with st.expander("Simulacion Adaptativa (Precision Objetivo)"):
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            tolerancia = st.select_slider("Semiancho objetivo del IC:",
+                                          options=[1e-1, 5e-2, 1e-2, 5e-3, 1e-3, 5e-4, 1e-4],
+                                          value=1e-3, format_func=lambda v: f"{v:g}")
+        with col2:
+            confianza_mc = st.selectbox("Nivel de confianza:", [0.90, 0.95, 0.99], index=1,
+                                        key="confianza_mc")
+        with col3:
+            tiempo_max = st.number_input("Tiempo maximo (s):", min_value=0.5, max_value=600.0,
+                                         value=10.0, step=0.5)
+        if st.button("Ejecutar hasta precision objetivo", use_container_width=True):
+            resultado = MonteCarlo.estimar_pi_adaptativo(gen, tolerancia, confianza_mc,
+                                                         tiempo_max=tiempo_max)
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                st.metric("π Estimado", f"{resultado['estimacion']:.6f}")
+            with col2:
+                st.metric("Semiancho IC", f"{resultado['semiancho']:.2e}")
+            with col3:
+                st.metric("Puntos Utilizados", f"{resultado['n']:,}")
+            with col4:
+                st.metric("Tiempo", f"{resultado['segundos']:.2f} s")
+            inf, sup = resultado['ic']
+            mensaje = f"IC {confianza_mc:.0%}: [{inf:.6f}, {sup:.6f}]"
+            if resultado['motivo'] == "tolerancia":
+                st.success(f"Precision objetivo alcanzada. {mensaje}")
+            else:
+                st.warning(f"Detenido por limite de {resultado['motivo']}. {mensaje}")
+
 # =========================================================
 # MANUAL DE USUARIO
 # =========================================================
@@ -1,10 +1,45 @@
+import copy
+import hashlib
+import json
 import math
+import os
+import re
+import tempfile
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, reduce
 import numpy as np
-from scipy.stats import poisson, expon, norm, chi2, kstest
+import pandas as pd
+from scipy.special import gammaln, ndtr, ndtri
+from scipy.stats import poisson, expon, norm, lognorm, uniform, chi2, kstest, kstwo
 
 # =========================================================
 # 1️⃣ GENERADOR LINEAL CONGRUENCIAL
 # =========================================================
+TAMANO_BLOQUE = 2**16
+_TABLAS_BLOQUE = {}
+
+
+def _tabla_bloque(a, c, m):
+    """Coeficientes (A_k, C_k) tales que x_k = (A_k * x_0 + C_k) mod m, k = 1..TAMANO_BLOQUE."""
+    clave = (a, c, m)
+    if clave not in _TABLAS_BLOQUE:
+        A = np.empty(TAMANO_BLOQUE, dtype=np.uint64)
+        C = np.empty(TAMANO_BLOQUE, dtype=np.uint64)
+        A[0], C[0] = a % m, c % m
+        mod = np.uint64(m)
+        k = 1
+        while k < TAMANO_BLOQUE:
+            # x_{k+j} = A_j * (A_k x + C_k) + C_j  →  se duplica la tabla en cada paso
+            j = min(k, TAMANO_BLOQUE - k)
+            A[k:k + j] = (A[:j] * A[k - 1]) % mod
+            C[k:k + j] = (A[:j] * C[k - 1] + C[:j]) % mod
+            k += j
+        _TABLAS_BLOQUE[clave] = (A, C)
+    return _TABLAS_BLOQUE[clave]
+
+
 class GeneradorLCG:
     def __init__(self, semilla=12345, a=1664525, c=1013904223, m=2**32):
         self.semilla = semilla
@@ -17,40 +52,350 @@ class GeneradorLCG:
         self.semilla = (self.a * self.semilla + self.c) % self.m
         return self.semilla / self.m
 
+    def siguientes(self, n):
+        """Devuelve un arreglo con los n siguientes números U(0,1).
+
+        Produce exactamente la misma secuencia que n llamadas a siguiente(),
+        calculada por bloques con aritmética uint64 (requiere m <= 2**32).
+        """
+        n = int(n)
+        if self.m > 2**32:
+            return np.array([self.siguiente() for _ in range(n)], dtype=np.float64)
+        A, C = _tabla_bloque(self.a, self.c, self.m)
+        mod = np.uint64(self.m)
+        salida = np.empty(n, dtype=np.float64)
+        for ini in range(0, n, TAMANO_BLOQUE):
+            b = min(TAMANO_BLOQUE, n - ini)
+            estados = (A[:b] * np.uint64(self.semilla % self.m) + C[:b]) % mod
+            salida[ini:ini + b] = estados
+            self.semilla = int(estados[-1])
+        return salida / self.m
+
+    def coeficientes_salto(self, k):
+        """Devuelve (A, C) tales que avanzar k pasos equivale a x -> (A*x + C) mod m.
+
+        Se obtiene componiendo la transformación afín (a, c) por duplicación,
+        en O(log k) operaciones.
+        """
+        A, C = 1, 0
+        a, c = self.a % self.m, self.c % self.m
+        k = int(k)
+        while k > 0:
+            if k & 1:
+                A, C = (a * A) % self.m, (a * C + c) % self.m
+            a, c = (a * a) % self.m, (a * c + c) % self.m
+            k >>= 1
+        return A, C
+
+    def saltar(self, k):
+        """Avanza el generador k posiciones sin producir los números intermedios."""
+        A, C = self.coeficientes_salto(k)
+        self.semilla = (A * self.semilla + C) % self.m
+        return self
+
+    def subflujo(self, i, longitud):
+        """Nuevo generador que comienza en la posición i*longitud de esta secuencia.
+
+        Los subflujos 0, 1, 2, ... con la misma longitud no se solapan mientras
+        cada uno consuma a lo sumo `longitud` números. El generador original no
+        se modifica.
+        """
+        return GeneradorLCG(self.semilla, self.a, self.c, self.m).saltar(i * longitud)
+
+    def dividir(self, k, longitud=None):
+        """Divide la secuencia en k subflujos consecutivos y disjuntos.
+
+        Por defecto reparte el periodo m en partes iguales.
+        """
+        if longitud is None:
+            longitud = self.m // k
+        return [self.subflujo(i, longitud) for i in range(k)]
+
+
+def _procesos(procesos, tareas):
+    """Número efectivo de procesos: None = todos los núcleos, a lo sumo uno por tarea."""
+    if procesos is None:
+        procesos = os.cpu_count() or 1
+    return max(1, min(int(procesos), tareas))
+
+
+def _cortes(total, partes):
+    """Límites (inicio, fin) de `partes` tramos consecutivos de casi igual tamaño."""
+    cortes = np.linspace(0, total, partes + 1).astype(np.int64).tolist()
+    return list(zip(cortes[:-1], cortes[1:]))
+
+
+def _con_progreso(resultados, total, progreso):
+    """Recolecta resultados en orden e informa la fracción completada tras cada uno."""
+    salida = []
+    for resultado in resultados:
+        salida.append(resultado)
+        if progreso is not None:
+            progreso(len(salida) / total)
+    return salida
+
+
+def _repartir(tarea, argumentos, procesos, progreso=None, chunksize=1):
+    """Aplica tarea a cada tupla de argumentos y devuelve los resultados en orden.
+
+    Con procesos == 1 se ejecuta en el proceso actual; si no, en un
+    ProcessPoolExecutor (tarea y argumentos deben poder serializarse).
+    progreso(fraccion), si se indica, se llama tras cada resultado.
+    """
+    argumentos = list(argumentos)
+    if procesos == 1 or len(argumentos) <= 1:
+        return _con_progreso((tarea(*a) for a in argumentos), len(argumentos), progreso)
+    with ProcessPoolExecutor(max_workers=procesos) as pool:
+        return _con_progreso(pool.map(tarea, *zip(*argumentos), chunksize=chunksize),
+                             len(argumentos), progreso)
+
 # =========================================================
 # 2️⃣ GENERADOR DE VARIABLES ALEATORIAS
 # =========================================================
+UMBRAL_PTRS = 10
+
+
+def _constantes_ptrs(lam):
+    """Constantes del método PTRS (Hörmann, 1993) para Poisson(λ), λ >= UMBRAL_PTRS."""
+    slam = math.sqrt(lam)
+    b = 0.931 + 2.53 * slam
+    a = -0.059 + 0.02483 * b
+    inv_alpha = 1.1239 + 1.1328 / (b - 3.4)
+    vr = 0.9277 - 3.6224 / (b - 2)
+    return a, b, math.log(inv_alpha), vr, math.log(lam)
+
+
+def _poisson_ptrs(lam, generador):
+    """Una muestra de Poisson(λ) por rechazo transformado (PTRS); O(1) esperado."""
+    a, b, log_inv_alpha, vr, loglam = _constantes_ptrs(lam)
+    while True:
+        U = generador.siguiente() - 0.5
+        V = generador.siguiente()
+        us = 0.5 - abs(U)
+        if us == 0:
+            continue
+        k = math.floor((2 * a / us + b) * U + lam + 0.43)
+        if us >= 0.07 and V <= vr:
+            return k
+        if k < 0 or (us < 0.013 and V > us):
+            continue
+        if V > 0 and (math.log(V) + log_inv_alpha - math.log(a / (us * us) + b)
+                      <= -lam + k * loglam - math.lgamma(k + 1)):
+            return k
+
+
+def _poisson_ptrs_vector(lam, n, generador):
+    """Versión vectorizada de PTRS: genera candidatos por lotes y conserva los aceptados en orden."""
+    a, b, log_inv_alpha, vr, loglam = _constantes_ptrs(lam)
+    salida = np.empty(n, dtype=np.int64)
+    lleno = 0
+    while lleno < n:
+        faltan = n - lleno
+        candidatos = faltan + faltan // 8 + 16
+        u = generador.siguientes(2 * candidatos)
+        U, V = u[0::2] - 0.5, u[1::2]
+        us = 0.5 - np.abs(U)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            k = np.floor((2 * a / us + b) * U + lam + 0.43)
+            acepta = (us >= 0.07) & (V <= vr)
+            lento = ~acepta & (us > 0) & (V > 0) & (k >= 0) & ~((us < 0.013) & (V > us))
+            kl, ul = k[lento], us[lento]
+            acepta[lento] = (np.log(V[lento]) + log_inv_alpha - np.log(a / (ul * ul) + b)
+                             <= -lam + kl * loglam - gammaln(kl + 1))
+        aceptados = k[acepta][:faltan]
+        salida[lleno:lleno + len(aceptados)] = aceptados
+        lleno += len(aceptados)
+    return salida
+
+
+# (capas, R, V) del zigurat de Marsaglia-Tsang en la variante de Doornik (2005)
+ZIGGURAT_NORMAL = (128, 3.442619855899, 9.91256303526217e-3)
+ZIGGURAT_EXPONENCIAL = (256, 7.69711747013104972, 3.949659822581572e-3)
+
+
+def _densidad_zigurat(x, normal):
+    """Densidad sin normalizar: exp(-x²/2) para la normal, exp(-x) para la exponencial."""
+    return np.exp(-0.5 * x * x) if normal else np.exp(-x)
+
+
+@lru_cache(maxsize=None)
+def _tablas_zigurat(normal):
+    """Tablas de capas (x_i, x_{i+1}/x_i, f(x_i)); se construyen una sola vez."""
+    capas, r, v = ZIGGURAT_NORMAL if normal else ZIGGURAT_EXPONENCIAL
+    x = np.zeros(capas + 1)
+    x[0] = v / float(_densidad_zigurat(r, normal))
+    x[1] = r
+    for i in range(2, capas):
+        y = v / x[i - 1] + float(_densidad_zigurat(x[i - 1], normal))
+        x[i] = math.sqrt(-2 * math.log(y)) if normal else -math.log(y)
+    return x, x[1:] / x[:-1], _densidad_zigurat(x, normal)
+
+
+def _cola_zigurat(k, generador, normal):
+    """k muestras de la cola x > R (Marsaglia para la normal; sin memoria para la exponencial)."""
+    _, r, _ = ZIGGURAT_NORMAL if normal else ZIGGURAT_EXPONENCIAL
+    if not normal:
+        return r - np.log(1 - generador.siguientes(k))
+    salida = np.empty(k)
+    lleno = 0
+    while lleno < k:
+        faltan = k - lleno
+        u = generador.siguientes(4 * faltan)
+        with np.errstate(divide="ignore"):
+            x = -np.log(1 - u[0::2]) / r
+            y = -np.log(1 - u[1::2])
+        aceptados = (r + x[2 * y > x * x])[:faltan]
+        salida[lleno:lleno + len(aceptados)] = aceptados
+        lleno += len(aceptados)
+    return salida
+
+
+def _zigurat_vector(n, generador, normal):
+    """n muestras N(0,1) o Exp(1) por el método del zigurat, en lotes vectorizados.
+
+    Cada candidato consume un solo uniforme: los bits altos eligen la capa y
+    el resto da la abscisa. El uniforme de la cuña sólo se pide para los
+    candidatos que caen fuera del rectángulo (~2% en la normal).
+    """
+    x, razon, fx = _tablas_zigurat(normal)
+    capas = len(razon)
+    salida = np.empty(n)
+    lleno = 0
+    while lleno < n:
+        faltan = n - lleno
+        m = faltan + faltan // 32 + 16
+        s = generador.siguientes(m)
+        s *= capas
+        i = s.astype(np.intp)
+        w = np.subtract(s, i, out=s)
+        if normal:
+            w *= 2
+            w -= 1
+        z = w * np.take(x, i)
+        acepta = np.abs(w) < np.take(razon, i)
+        # Sólo los rechazados (pocos) pasan a la cuña o a la cola.
+        rechazados = np.flatnonzero(~acepta)
+        cuna, cola = rechazados[i[rechazados] > 0], rechazados[i[rechazados] == 0]
+        ic = i[cuna]
+        v = generador.siguientes(len(ic))
+        acepta[cuna] = fx[ic] + v * (fx[ic + 1] - fx[ic]) < _densidad_zigurat(z[cuna], normal)
+        if len(cola):
+            z[cola] = np.copysign(_cola_zigurat(len(cola), generador, normal), w[cola])
+            acepta[cola] = True
+        aceptados = z[acepta][:faltan]
+        salida[lleno:lleno + len(aceptados)] = aceptados
+        lleno += len(aceptados)
+    return salida
+
+
+def _zigurat_escalar(generador, normal):
+    """Una muestra N(0,1) o Exp(1) por el método del zigurat."""
+    x, razon, fx = _tablas_zigurat(normal)
+    capas = len(razon)
+    while True:
+        s = generador.siguiente() * capas
+        i = int(s)
+        w = 2 * (s - i) - 1 if normal else s - i
+        z = w * x[i]
+        if abs(w) < razon[i]:
+            return float(z)
+        if i == 0:
+            return math.copysign(float(_cola_zigurat(1, generador, normal)[0]), w)
+        if fx[i] + generador.siguiente() * (fx[i + 1] - fx[i]) < _densidad_zigurat(z, normal):
+            return float(z)
+
+
+@lru_cache(maxsize=64)
+def _tabla_poisson(lam):
+    """Función de distribución acumulada de Poisson(λ) tabulada hasta la cola despreciable."""
+    p = math.exp(-lam)
+    acumulada, k = [p], 0
+    while acumulada[-1] < 1 - 1e-15 and (k < lam or p > 0):
+        k += 1
+        p *= lam / k
+        acumulada.append(acumulada[-1] + p)
+    tabla = np.array(acumulada)
+    tabla[-1] = 1.0
+    return tabla
+
+
 class GeneradorVariables:
-    def __init__(self, generador: GeneradorLCG):
+    def __init__(self, generador: GeneradorLCG, vectorizado=True):
+        """Con vectorizado=False se usa la versión escalar (didáctica), que devuelve listas."""
         self.generador = generador
+        self.vectorizado = vectorizado
 
     def uniforme(self, n):
+        if self.vectorizado:
+            return self.generador.siguientes(n)
         return [self.generador.siguiente() for _ in range(n)]
 
-    def exponencial(self, lam, n):
-        """Distribución Exponencial con parámetro lambda."""
+    def exponencial(self, lam, n, metodo="inversa"):
+        """Distribución Exponencial con parámetro lambda.
+
+        metodo: "inversa" (transformada inversa) o "ziggurat".
+        """
+        if metodo == "ziggurat":
+            if self.vectorizado:
+                return _zigurat_vector(n, self.generador, False) / lam
+            return [_zigurat_escalar(self.generador, False) / lam for _ in range(n)]
+        if metodo != "inversa":
+            raise ValueError(f"Metodo no soportado: {metodo}")
+        if self.vectorizado:
+            return -np.log(1 - self.generador.siguientes(n)) / lam
         return [-math.log(1 - self.generador.siguiente()) / lam for _ in range(n)]
 
-    def normal(self, mu, sigma, n):
-        """Distribución Normal usando Box-Muller."""
+    def normal(self, mu, sigma, n, metodo="box-muller"):
+        """Distribución Normal.
+
+        metodo: "box-muller" o "ziggurat". La versión escalar de Box-Muller
+        reproduce exactamente la implementación original; la vectorizada usa
+        los mismos uniformes y difiere de ella a lo sumo en el último bit.
+        """
+        if metodo == "ziggurat":
+            if self.vectorizado:
+                return mu + sigma * _zigurat_vector(n, self.generador, True)
+            return [mu + sigma * _zigurat_escalar(self.generador, True) for _ in range(n)]
+        if metodo != "box-muller":
+            raise ValueError(f"Metodo no soportado: {metodo}")
+        if self.vectorizado:
+            pares = (n + 1) // 2
+            u = self.generador.siguientes(2 * pares)
+            r = np.sqrt(-2 * np.log(u[0::2]))
+            theta = 2 * np.pi * u[1::2]
+            z = np.empty(2 * pares)
+            z[0::2] = r * np.cos(theta)
+            z[1::2] = r * np.sin(theta)
+            return mu + sigma * z[:n]
         datos = []
         for _ in range(n // 2):
             u1, u2 = self.generador.siguiente(), self.generador.siguiente()
-            z1 = math.sqrt(-2 * math.log(u1)) * math.cos(2 * math.pi * u2)
-            z2 = math.sqrt(-2 * math.log(u1)) * math.sin(2 * math.pi * u2)
-            datos.append(mu + sigma * z1)
-            datos.append(mu + sigma * z2)
+            r = math.sqrt(-2 * math.log(u1))
+            datos.append(mu + sigma * (r * math.cos(2 * math.pi * u2)))
+            datos.append(mu + sigma * (r * math.sin(2 * math.pi * u2)))
         if n % 2 != 0:
             u1, u2 = self.generador.siguiente(), self.generador.siguiente()
-            z1 = math.sqrt(-2 * math.log(u1)) * math.cos(2 * math.pi * u2)
-            datos.append(mu + sigma * z1)
+            r = math.sqrt(-2 * math.log(u1))
+            datos.append(mu + sigma * (r * math.cos(2 * math.pi * u2)))
         return datos
 
     def poisson(self, lam, n):
-        """Distribución de Poisson con media λ."""
+        """Distribución de Poisson con media λ.
+
+        Para λ >= UMBRAL_PTRS se usa el rechazo transformado PTRS, de costo
+        esperado O(1) y sin desbordamiento de exp(-λ). Por debajo, la versión
+        vectorizada usa la transformada inversa sobre la FDA tabulada (un
+        uniforme por muestra) y la escalar el método multiplicativo.
+        """
+        if lam >= UMBRAL_PTRS:
+            if self.vectorizado:
+                return _poisson_ptrs_vector(lam, n, self.generador)
+            return [_poisson_ptrs(lam, self.generador) for _ in range(n)]
+        if self.vectorizado:
+            return np.searchsorted(_tabla_poisson(lam), self.generador.siguientes(n), side="right")
         datos = []
+        L = math.exp(-lam)
         for _ in range(n):
-            L = math.exp(-lam)
             k, p = 0, 1
             while p > L:
                 k += 1
@@ -58,19 +403,334 @@ class GeneradorVariables:
             datos.append(k - 1)
         return datos
 
+    def bloques(self, distribucion, params, n, tamano=2**20, **opciones):
+        """Genera n valores de la distribución indicada en bloques de a lo sumo `tamano`.
+
+        distribucion es el nombre de un método ("poisson", "exponencial",
+        "normal", "uniforme"); la memoria usada es proporcional al bloque.
+        """
+        generar = getattr(self, distribucion)
+        tamano += tamano % 2  # bloques pares: Box-Muller no desperdicia uniformes
+        for ini in range(0, n, tamano):
+            yield np.asarray(generar(*params, min(tamano, n - ini), **opciones))
+
+    def discreta(self, valores, probabilidades, n):
+        """Distribución discreta arbitraria mediante el método de alias."""
+        datos = MuestreadorAlias(valores, probabilidades).muestrear(n, self.generador)
+        return datos if self.vectorizado else datos.tolist()
+
+
+MAX_TABLAS_ALIAS = 128
+_TABLAS_ALIAS = OrderedDict()
+
+
+def _tablas_alias(probabilidades):
+    """Tablas de Walker/Vose en O(k), cacheadas por hash de las probabilidades.
+
+    Las tablas no dependen de los valores, así que distribuciones con los
+    mismos pesos sobre valores distintos comparten la entrada.
+    """
+    clave = (probabilidades.dtype.str, probabilidades.shape, hashlib.sha1(probabilidades.tobytes()).hexdigest())
+    if clave in _TABLAS_ALIAS:
+        _TABLAS_ALIAS.move_to_end(clave)
+        return _TABLAS_ALIAS[clave]
+    k = len(probabilidades)
+    escalada = probabilidades / probabilidades.sum() * k
+    prob = np.ones(k)
+    alias = np.arange(k)
+    pequenos = [i for i in range(k) if escalada[i] < 1]
+    grandes = [i for i in range(k) if escalada[i] >= 1]
+    while pequenos and grandes:
+        s, g = pequenos.pop(), grandes.pop()
+        prob[s], alias[s] = escalada[s], g
+        escalada[g] -= 1 - escalada[s]
+        (pequenos if escalada[g] < 1 else grandes).append(g)
+    _TABLAS_ALIAS[clave] = (prob, alias)
+    if len(_TABLAS_ALIAS) > MAX_TABLAS_ALIAS:
+        _TABLAS_ALIAS.popitem(last=False)
+    return prob, alias
+
+
+class MuestreadorAlias:
+    """Muestreo de una distribución discreta arbitraria: tablas O(k), muestras O(1)."""
+
+    def __init__(self, valores, probabilidades):
+        self.valores = np.asarray(valores)
+        probabilidades = np.asarray(probabilidades, dtype=np.float64)
+        if len(self.valores) != len(probabilidades) or len(probabilidades) == 0:
+            raise ValueError("valores y probabilidades deben tener la misma longitud (> 0)")
+        if np.any(probabilidades < 0) or probabilidades.sum() <= 0:
+            raise ValueError("las probabilidades deben ser no negativas y no todas nulas")
+        self.prob, self.alias = _tablas_alias(probabilidades)
+
+    @classmethod
+    def desde_datos(cls, datos):
+        """Distribución empírica (histograma de frecuencias) de los datos observados."""
+        valores, frecuencias = np.unique(datos, return_counts=True)
+        return cls(valores, frecuencias)
+
+    def muestrear(self, n, generador: GeneradorLCG, lote=2**20):
+        """n muestras usando dos uniformes por muestra (columna y moneda sesgada).
+
+        Los uniformes se piden por lotes de a lo sumo `lote` muestras; el
+        resultado no depende del tamaño del lote.
+        """
+        n = int(n)
+        salida = np.empty(n, dtype=self.valores.dtype)
+        for ini in range(0, n, lote):
+            b = min(lote, n - ini)
+            u = generador.siguientes(2 * b)
+            columna = (u[0::2] * len(self.prob)).astype(np.int64)
+            indices = np.where(u[1::2] < self.prob[columna], columna, self.alias[columna])
+            salida[ini:ini + b] = self.valores[indices]
+        return salida
+
+
+class CacheMuestras:
+    """Caché LRU de muestras generadas, acotada por un presupuesto de memoria en bytes.
+
+    Pensada para resultados deterministas (semilla manual): la clave debe
+    incluir distribución, parámetros, n, semilla, método y constantes del LCG.
+    """
+
+    def __init__(self, memoria_max=256 * 2**20):
+        self.memoria_max = memoria_max
+        self.memoria_usada = 0
+        self.aciertos = 0
+        self.fallos = 0
+        self._datos = OrderedDict()
+
+    def obtener(self, clave, generar):
+        """Devuelve la muestra cacheada para la clave o la genera con generar() y la guarda."""
+        if clave in self._datos:
+            self._datos.move_to_end(clave)
+            self.aciertos += 1
+            return self._datos[clave]
+        self.fallos += 1
+        datos = np.asarray(generar())
+        datos.setflags(write=False)
+        if datos.nbytes <= self.memoria_max:
+            self._datos[clave] = datos
+            self.memoria_usada += datos.nbytes
+            self._liberar()
+        return datos
+
+    def ajustar_memoria(self, memoria_max):
+        """Cambia el presupuesto de memoria y descarta las entradas menos usadas si se excede."""
+        self.memoria_max = memoria_max
+        self._liberar()
+
+    def limpiar(self):
+        self._datos.clear()
+        self.memoria_usada = 0
+
+    def __len__(self):
+        return len(self._datos)
+
+    def _liberar(self):
+        while self.memoria_usada > self.memoria_max and self._datos:
+            _, datos = self._datos.popitem(last=False)
+            self.memoria_usada -= datos.nbytes
+
 # =========================================================
 # 3️⃣ PRUEBAS DE AJUSTE
 # =========================================================
+def en_bloques(datos, tamano=2**20):
+    """Recorre un arreglo (o memmap) por rebanadas contiguas sin copiarlo completo."""
+    for ini in range(0, len(datos), tamano):
+        yield np.asarray(datos[ini:ini + tamano])
+
+
+def _fusionar_momentos(acumulado, valores):
+    """Agrega un lote a (n, media, m2) con la fusión de Chan."""
+    n, media, m2 = acumulado
+    nb = len(valores)
+    if nb == 0:
+        return acumulado
+    media_b = float(np.mean(valores))
+    m2_b = float(np.sum((valores - media_b) ** 2))
+    return _combinar_momentos(acumulado, (nb, media_b, m2_b))
+
+
+def _combinar_momentos(a, b):
+    """Combina dos resúmenes (n, media, m2) de muestras disjuntas."""
+    total = a[0] + b[0]
+    delta = b[1] - a[1]
+    return total, a[1] + delta * b[0] / total, a[2] + b[2] + delta**2 * a[0] * b[0] / total
+
+
+def _chi2_desde_conteos(valores, frec_obs, n, distribucion, params):
+    frec_esp = n * distribucion.pmf(valores, *params)
+    chi2_stat = np.sum((frec_obs - frec_esp) ** 2 / frec_esp)
+    gl = len(frec_obs) - len(params) - 1
+    p_val = 1 - chi2.cdf(chi2_stat, gl)
+    return chi2_stat, gl, p_val
+
+
+def _agrupar_escasas(frec_obs, frec_esp, minimo):
+    """Fusiona intervalos contiguos hasta que cada uno tenga frecuencia esperada >= minimo."""
+    obs, esp = [], []
+    acum_obs, acum_esp = 0, 0.0
+    for o, e in zip(frec_obs.tolist(), frec_esp.tolist()):
+        acum_obs += o
+        acum_esp += e
+        if acum_esp >= minimo:
+            obs.append(acum_obs)
+            esp.append(acum_esp)
+            acum_obs, acum_esp = 0, 0.0
+    if acum_esp > 0 or acum_obs > 0:
+        if obs:
+            obs[-1] += acum_obs
+            esp[-1] += acum_esp
+        else:
+            obs.append(acum_obs)
+            esp.append(acum_esp)
+    return np.array(obs), np.array(esp)
+
+
+FAMILIAS_BOOTSTRAP = ("normal", "exponencial")
+ELEMENTOS_POR_BLOQUE = 2**22
+
+
+def _ks_ajustado(muestras, familia):
+    """D de KS de cada fila contra la distribución de la familia ajustada a esa fila."""
+    x = np.sort(muestras, axis=1)
+    n = x.shape[1]
+    if familia == "normal":
+        media = x.mean(axis=1, keepdims=True)
+        desviacion = x.std(axis=1, keepdims=True)
+        F = ndtr((x - media) / desviacion)
+    else:
+        F = -np.expm1(-x / x.mean(axis=1, keepdims=True))
+    i = np.arange(1, n + 1) / n
+    return np.maximum(np.max(i - F, axis=1), np.max(F - (i - 1 / n), axis=1))
+
+
+def _uniformes_por_replica(familia, n):
+    return n + n % 2 if familia == "normal" else n
+
+
+def _replicas_ks(familia, n, params, semilla, a, c, m, inicio, fin):
+    """Estadísticos D* de las réplicas bootstrap [inicio, fin) (tarea de un proceso).
+
+    La réplica r usa el subflujo r del LCG, así el resultado no depende de
+    cómo se repartan las réplicas entre procesos.
+    """
+    longitud = _uniformes_por_replica(familia, n)
+    filas = max(1, ELEMENTOS_POR_BLOQUE // longitud)
+    base = GeneradorLCG(semilla, a, c, m)
+    salida = np.empty(fin - inicio)
+    for r0 in range(inicio, fin, filas):
+        r1 = min(fin, r0 + filas)
+        variables = GeneradorVariables(base.subflujo(r0, longitud))
+        if familia == "normal":
+            muestras = variables.normal(*params, (r1 - r0) * longitud)
+        else:
+            muestras = variables.exponencial(*params, (r1 - r0) * longitud)
+        salida[r0 - inicio:r1 - inicio] = _ks_ajustado(muestras.reshape(r1 - r0, longitud)[:, :n], familia)
+    return salida
+
+
+FAMILIAS_LOTE = ("poisson", "exponencial", "normal", "lognormal", "uniforme")
+
+
+def _resumen_conjunto(datos):
+    """Estadísticos suficientes de un conjunto; se calculan una vez y se comparten entre familias."""
+    x = np.asarray(datos, dtype=np.float64)
+    x = np.sort(x[np.isfinite(x)])
+    if len(x) == 0:
+        return None
+    resumen = {"x": x, "n": len(x), "media": float(x.mean()), "desviacion": float(x.std()),
+               "minimo": float(x[0]), "maximo": float(x[-1]),
+               "enteros": bool(x[0] >= 0 and np.all(x == np.round(x)))}
+    if resumen["enteros"]:
+        resumen["valores"], resumen["conteos"] = np.unique(x, return_counts=True)
+    if x[0] > 0:
+        logx = np.log(x)
+        resumen["media_log"], resumen["desviacion_log"] = float(logx.mean()), float(logx.std())
+    return resumen
+
+
+def _ajustar_familia(familia, r):
+    """(distribución congelada, nº de parámetros) ajustada por máxima verosimilitud, o None si no aplica."""
+    if familia == "poisson":
+        return (poisson(r["media"]), 1) if r["enteros"] else None
+    if familia == "exponencial":
+        return (expon(0, r["media"]), 1) if r["minimo"] >= 0 and r["media"] > 0 else None
+    if familia == "normal":
+        return (norm(r["media"], r["desviacion"]), 2) if r["desviacion"] > 0 else None
+    if familia == "lognormal":
+        if "media_log" not in r or r["desviacion_log"] <= 0:
+            return None
+        return lognorm(r["desviacion_log"], scale=math.exp(r["media_log"])), 2
+    if familia == "uniforme":
+        ancho = r["maximo"] - r["minimo"]
+        return (uniform(r["minimo"], ancho), 2) if ancho > 0 else None
+    raise ValueError(f"Familia no soportada: {familia}")
+
+
+def _log_verosimilitud(dist, r):
+    """Log-verosimilitud del ajuste; con datos enteros, la de la distribución discretizada.
+
+    Una densidad y una pmf no son comparables en el AIC, así que con datos
+    enteros cada valor k de una familia continua recibe la masa de [k-½, k+½].
+    """
+    if not r["enteros"]:
+        return float(np.sum(dist.logpdf(r["x"])))
+    k = r["valores"]
+    if dist.dist.name == "poisson":
+        masa_log = dist.logpmf(k)
+    else:
+        # Por encima de la mediana se restan colas superiores para no perder precisión.
+        masa = np.where(k > dist.median(), dist.sf(k - 0.5) - dist.sf(k + 0.5),
+                        dist.cdf(k + 0.5) - dist.cdf(k - 0.5))
+        with np.errstate(divide="ignore"):
+            masa_log = np.log(masa)
+    return float(np.sum(r["conteos"] * masa_log))
+
+
+def _evaluar_conjunto(nombre, datos, familias):
+    """Filas de resultados de un conjunto contra cada familia candidata (tarea de un proceso)."""
+    r = _resumen_conjunto(datos)
+    if r is None:
+        return []
+    x, n = r["x"], r["n"]
+    i = np.arange(1, n + 1) / n
+    filas = []
+    for familia in familias:
+        ajuste = _ajustar_familia(familia, r)
+        if ajuste is None:
+            continue
+        dist, k = ajuste
+        if familia == "poisson":
+            estadistico, _, p_val = PruebasAjuste.chi_cuadrado_agrupado(x, poisson, dist.args, estimados=1)
+            prueba = "Chi-Cuadrado"
+        else:
+            F = dist.cdf(x)
+            estadistico = float(np.maximum(np.max(i - F), np.max(F - (i - 1 / n))))
+            p_val = float(kstwo.sf(estadistico, n))
+            prueba = "Kolmogorov-Smirnov"
+        log_ver = _log_verosimilitud(dist, r)
+        filas.append({"conjunto": nombre, "familia": familia, "n": n, "prueba": prueba,
+                      "parametros": tuple(float(v) for v in dist.args) + tuple(float(v) for v in dist.kwds.values()),
+                      "estadistico": float(estadistico), "valor_p": float(p_val),
+                      "log_verosimilitud": log_ver, "aic": 2 * k - 2 * log_ver})
+    # Los valores p no son comparables entre candidatas (χ² agrupado frente a KS
+    # asintótico con parámetros estimados): se ordena por AIC y el valor p solo
+    # da el dictamen de conformidad.
+    filas.sort(key=lambda f: f["aic"])
+    for rango, fila in enumerate(filas, start=1):
+        fila["rango"] = rango
+        fila["conforme"] = fila["valor_p"] > 0.05
+    return filas
+
+
 class PruebasAjuste:
     @staticmethod
     def chi_cuadrado(datos, distribucion, params):
         """Prueba Chi-cuadrado (para datos discretos, p. ej. Poisson)."""
         valores, frec_obs = np.unique(datos, return_counts=True)
-        frec_esp = len(datos) * distribucion.pmf(valores, *params)
-        chi2_stat = np.sum((frec_obs - frec_esp) ** 2 / frec_esp)
-        gl = len(frec_obs) - len(params) - 1
-        p_val = 1 - chi2.cdf(chi2_stat, gl)
-        return chi2_stat, gl, p_val
+        return _chi2_desde_conteos(valores, frec_obs, len(datos), distribucion, params)
 
     @staticmethod
     def kolmogorov_smirnov(datos, distribucion, params):
@@ -78,16 +738,1165 @@ class PruebasAjuste:
         d_stat, p_val = kstest(datos, distribucion.cdf, args=params)
         return d_stat, p_val
 
+    @staticmethod
+    def chi_cuadrado_agrupado(datos, distribucion, params, k=None, estimados=None, minimo_esperado=5):
+        """Prueba Chi-cuadrado por intervalos equiprobables (válida para datos continuos).
+
+        Los bordes son los cuantiles teóricos ppf(i/k); por defecto k ≈ 2·n^0.4
+        (acotado para que cada intervalo espere al menos minimo_esperado casos).
+        El conteo usa searchsorted + bincount por bloques: O(n log k) y memoria
+        acotada. Los intervalos con frecuencia esperada escasa se fusionan con
+        sus vecinos. estimados es el número de parámetros ajustados con los
+        datos (por defecto len(params)).
+        """
+        n = len(datos)
+        if k is None:
+            k = max(2, min(int(math.ceil(2 * n ** 0.4)), n // minimo_esperado))
+        bordes = np.unique(distribucion.ppf(np.arange(1, k) / k, *params))
+        bordes = bordes[np.isfinite(bordes)]
+        frec_obs = np.zeros(len(bordes) + 1, dtype=np.int64)
+        for bloque in en_bloques(datos):
+            frec_obs += np.bincount(np.searchsorted(bordes, bloque, side="left"), minlength=len(frec_obs))
+        acumulada = np.concatenate(([0.0], distribucion.cdf(bordes, *params), [1.0]))
+        frec_esp = n * np.diff(acumulada)
+        frec_obs, frec_esp = _agrupar_escasas(frec_obs, frec_esp, minimo_esperado)
+        chi2_stat = float(np.sum((frec_obs - frec_esp) ** 2 / frec_esp))
+        gl = len(frec_obs) - 1 - (len(params) if estimados is None else estimados)
+        p_val = float(chi2.sf(chi2_stat, gl)) if gl > 0 else float("nan")
+        return chi2_stat, gl, p_val
+
+    @staticmethod
+    def ks_bootstrap(datos, familia, generador: GeneradorLCG, B=1000, procesos=1):
+        """Valor p de KS por bootstrap paramétrico (tipo Lilliefors).
+
+        Corrige el sesgo del valor p asintótico cuando los parámetros se
+        estiman con los mismos datos: se simulan B muestras de la familia
+        ajustada ("normal" o "exponencial"), se reajusta cada una y se
+        compara su D* con el observado. Las réplicas usan subflujos
+        deterministas del LCG y pueden repartirse en un pool de procesos.
+        Devuelve (D, valor p, error estándar Monte Carlo del valor p).
+        """
+        if familia not in FAMILIAS_BOOTSTRAP:
+            raise ValueError(f"Familia no soportada: {familia}")
+        datos = np.asarray(datos, dtype=np.float64)
+        n = len(datos)
+        d_stat = float(_ks_ajustado(datos[np.newaxis, :], familia)[0])
+        params = (np.mean(datos), np.std(datos)) if familia == "normal" else (1 / np.mean(datos),)
+        procesos = _procesos(procesos, B)
+        base = (familia, n, params, generador.semilla, generador.a, generador.c, generador.m)
+        replicas = np.concatenate(_repartir(_replicas_ks, [base + tramo for tramo in _cortes(B, procesos)], procesos))
+        generador.saltar(B * _uniformes_por_replica(familia, n))
+        p_val = (1 + int(np.count_nonzero(replicas >= d_stat))) / (B + 1)
+        return d_stat, p_val, math.sqrt(p_val * (1 - p_val) / B)
+
+    @staticmethod
+    def evaluar_lote(conjuntos, familias=FAMILIAS_LOTE, procesos=1):
+        """Evalúa muchos conjuntos de datos contra varias familias candidatas.
+
+        conjuntos es una lista de arreglos o un diccionario nombre -> arreglo.
+        Cada conjunto se ordena y resume una sola vez y ese trabajo se comparte
+        entre las familias; los conjuntos se reparten en un pool de procesos.
+        Devuelve una tabla (lista de diccionarios) ordenada por conjunto y
+        rango (menor AIC primero); valor_p y conforme son el dictamen de cada
+        prueba. Con datos enteros la verosimilitud de las familias continuas
+        se discretiza para que su AIC sea comparable con el de Poisson. Los
+        conjuntos sin valores finitos se omiten de la tabla.
+        """
+        if not isinstance(conjuntos, dict):
+            conjuntos = {f"Serie {i + 1}": datos for i, datos in enumerate(conjuntos)}
+        procesos = _procesos(procesos, len(conjuntos))
+        familias = tuple(familias)
+        tareas = [(nombre, datos, familias) for nombre, datos in conjuntos.items()]
+        resultados = _repartir(_evaluar_conjunto, tareas, procesos,
+                               chunksize=max(1, len(tareas) // (4 * procesos)))
+        return [fila for filas in resultados for fila in filas]
+
+    @staticmethod
+    def chi_cuadrado_flujo(bloques, distribucion, params):
+        """Chi-cuadrado sobre un iterable de bloques, en memoria acotada."""
+        acumulador = AcumuladorChiCuadrado()
+        for bloque in bloques:
+            acumulador.agregar(bloque)
+        return acumulador.finalizar(distribucion, params)
+
+    @staticmethod
+    def kolmogorov_smirnov_flujo(bloques, distribucion, params, celdas=2**16):
+        """KS aproximado sobre un iterable de bloques; devuelve (D, p, error máximo de D)."""
+        acumulador = AcumuladorKS(distribucion, params, celdas)
+        for bloque in bloques:
+            acumulador.agregar(bloque)
+        return acumulador.finalizar()
+
+    @staticmethod
+    def media_desviacion(datos, tamano=2**20):
+        """Media y desviación estándar poblacional por bloques (fusión de Chan), sin copias completas."""
+        n, media, m2 = reduce(_fusionar_momentos, en_bloques(datos, tamano), (0, 0.0, 0.0))
+        return media, math.sqrt(m2 / n) if n else float("nan")
+
+
+class AcumuladorChiCuadrado:
+    """Chi-cuadrado incremental para datos discretos: conteos por categoría bloque a bloque."""
+
+    def __init__(self):
+        self.conteos = {}
+        self.n = 0
+
+    def agregar(self, bloque):
+        valores, frecuencias = np.unique(np.asarray(bloque), return_counts=True)
+        for valor, frecuencia in zip(valores.tolist(), frecuencias.tolist()):
+            self.conteos[valor] = self.conteos.get(valor, 0) + frecuencia
+        self.n += len(bloque)
+        return self
+
+    def fusionar(self, otro):
+        """Combina los conteos de otro acumulador (p. ej. de otro proceso)."""
+        for valor, frecuencia in otro.conteos.items():
+            self.conteos[valor] = self.conteos.get(valor, 0) + frecuencia
+        self.n += otro.n
+        return self
+
+    def finalizar(self, distribucion, params):
+        """Devuelve (χ², gl, p) igual que PruebasAjuste.chi_cuadrado sobre todos los datos."""
+        valores = np.array(sorted(self.conteos))
+        frec_obs = np.array([self.conteos[v] for v in valores.tolist()])
+        return _chi2_desde_conteos(valores, frec_obs, self.n, distribucion, params)
+
+
+class AcumuladorKS:
+    """Kolmogorov-Smirnov aproximado en flujo, con memoria fija.
+
+    Funciona como un boceto de cuantiles de rejilla fija: guarda un histograma
+    de u = F(x) en `celdas` intervalos iguales de [0, 1]. Es fusionable
+    (los conteos se suman) y la estadística en los bordes, D_B, acota la
+    exacta: D_B <= D <= D_B + 1/celdas.
+    """
+
+    def __init__(self, distribucion, params, celdas=2**16):
+        self.distribucion = distribucion
+        self.params = tuple(params)
+        self.conteos = np.zeros(celdas, dtype=np.int64)
+        self.n = 0
+
+    def agregar(self, bloque):
+        u = self.distribucion.cdf(np.asarray(bloque), *self.params)
+        celdas = len(self.conteos)
+        indices = np.minimum((u * celdas).astype(np.int64), celdas - 1)
+        self.conteos += np.bincount(indices, minlength=celdas)
+        self.n += len(bloque)
+        return self
+
+    def fusionar(self, otro):
+        if len(otro.conteos) != len(self.conteos) or otro.params != self.params:
+            raise ValueError("Solo se pueden fusionar acumuladores con la misma hipótesis y rejilla")
+        self.conteos += otro.conteos
+        self.n += otro.n
+        return self
+
+    def finalizar(self):
+        """Devuelve (D_B, valor p de D_B, error máximo de D)."""
+        celdas = len(self.conteos)
+        empirica = np.concatenate(([0], np.cumsum(self.conteos))) / self.n
+        bordes = np.arange(celdas + 1) / celdas
+        d_stat = float(np.max(np.abs(empirica - bordes)))
+        return d_stat, float(kstwo.sf(d_stat, self.n)), 1 / celdas
+
 # =========================================================
 # 4️⃣ MÉTODO DE MONTE CARLO
 # =========================================================
+def _aciertos_circulo(generador, n):
+    """Cuenta cuántos de n puntos (x, y) del generador caen dentro del círculo unitario."""
+    dentro = 0
+    for ini in range(0, n, TAMANO_BLOQUE // 2):
+        b = min(TAMANO_BLOQUE // 2, n - ini)
+        u = generador.siguientes(2 * b)
+        x, y = u[0::2], u[1::2]
+        dentro += int(np.count_nonzero(x**2 + y**2 <= 1))
+    return dentro
+
+
+def _cuarto_circulo(u):
+    """Integrando del estimador de media muestral: π = ∫₀¹ 4√(1 − u²) du."""
+    return 4 * np.sqrt(1 - u * u)
+
+
+def _reduccion_varianza(metodo, n, generador):
+    """(estimación, varianza del estimador, uniformes consumidos) para un presupuesto de 2n uniformes."""
+    U = 2 * n
+    if metodo == "acierto":
+        u = generador.siguientes(U)
+        f = 4.0 * (u[0::2]**2 + u[1::2]**2 <= 1)
+        return f.mean(), f.var(ddof=1) / n, U
+    if metodo == "media_muestral":
+        f = _cuarto_circulo(generador.siguientes(U))
+        return f.mean(), f.var(ddof=1) / U, U
+    if metodo == "antiteticas":
+        u = generador.siguientes(U)
+        f = (_cuarto_circulo(u) + _cuarto_circulo(1 - u)) / 2
+        return f.mean(), f.var(ddof=1) / U, U
+    if metodo == "control":
+        # Variable de control g(u) = 4(1 − u²), con E[g] = 8/3 conocida.
+        u = generador.siguientes(U)
+        f, g = _cuarto_circulo(u), 4 * (1 - u * u)
+        beta = np.cov(f, g)[0, 1] / g.var(ddof=1)
+        r = f - beta * (g - 8 / 3)
+        return r.mean(), r.var(ddof=1) / (U - 1), U
+    if metodo == "estratificado":
+        # Un punto por estrato; la varianza se estima con pares de estratos vecinos.
+        f = _cuarto_circulo((np.arange(U) + generador.siguientes(U)) / U)
+        return f.mean(), np.sum((f[0::2] - f[1::2])**2) / U**2, U
+    if metodo == "hipercubo_latino":
+        # Réplicas independientes de un hipercubo latino 2D sobre el acierto/fallo;
+        # cada punto cuesta x, y y un uniforme para la permutación de estratos en y.
+        replicas = 10
+        m = max(2, U // (3 * replicas))
+        estimaciones = np.empty(replicas)
+        for r in range(replicas):
+            u = generador.siguientes(3 * m)
+            x = (np.arange(m) + u[:m]) / m
+            y = (np.argsort(u[2 * m:]) + u[m:2 * m]) / m
+            estimaciones[r] = 4 * np.count_nonzero(x * x + y * y <= 1) / m
+        return estimaciones.mean(), estimaciones.var(ddof=1) / replicas, 3 * m * replicas
+    raise ValueError(f"Método de reducción no soportado: {metodo}")
+
+
+def _puntos_traza(total, resolucion):
+    """Tamaños de prefijo equiespaciados en los que se registra la traza de convergencia."""
+    puntos = max(1, min(int(resolucion), total))
+    return np.unique(np.linspace(total / puntos, total, puntos).astype(np.int64))
+
+
+def _traza_desde_conteos(n, conteos, confianza):
+    """Estimación de π e intervalo de confianza para cada prefijo n con `conteos` aciertos."""
+    p = conteos / n
+    z = float(norm.ppf(0.5 + confianza / 2))
+    semiancho = 4 * z * np.sqrt(p * (1 - p) / n)
+    return {"n": n, "estimacion": 4 * p, "ic_inf": 4 * p - semiancho, "ic_sup": 4 * p + semiancho}
+
+
+def _simular_tramo(generador, inicio, fin, paso, controles):
+    """Simula los puntos [inicio, fin) en una pasada (tarea de un proceso).
+
+    Devuelve el total de aciertos, las coordenadas y aciertos de los puntos
+    cuyo índice global es múltiplo de `paso`, y el conteo de aciertos del
+    tramo hasta cada prefijo de `controles` que cae en (inicio, fin].
+    """
+    dentro = 0
+    xs, ys = [np.empty(0)], [np.empty(0)]
+    ds, conteos = [np.empty(0, dtype=bool)], [np.empty(0, dtype=np.int64)]
+    controles = controles[(controles > inicio) & (controles <= fin)]
+    for ini in range(inicio, fin, TAMANO_BLOQUE // 2):
+        b = min(TAMANO_BLOQUE // 2, fin - ini)
+        u = generador.siguientes(2 * b)
+        x, y = u[0::2], u[1::2]
+        aciertos = x**2 + y**2 <= 1
+        primero = -ini % paso
+        # Copias: una vista a paso fijo mantendría vivo todo el bloque u.
+        xs.append(x[primero::paso].copy())
+        ys.append(y[primero::paso].copy())
+        ds.append(aciertos[primero::paso].copy())
+        locales = controles[(controles > ini) & (controles <= ini + b)] - ini
+        if len(locales):
+            conteos.append(dentro + np.cumsum(aciertos, dtype=np.int64)[locales - 1])
+        dentro += int(np.count_nonzero(aciertos))
+    return dentro, np.concatenate(xs), np.concatenate(ys), np.concatenate(ds), np.concatenate(conteos)
+
+
+def _aciertos_prefijos(generador, escalas):
+    """Aciertos en cada prefijo `escalas` (ordenadas) de una corrida de tamaño max(escalas)."""
+    return _simular_tramo(generador, 0, int(escalas[-1]), int(escalas[-1]), escalas)[4]
+
+
+RESERVA_UNIFORMES = 16  # uniformes reservados por muestra y variable en cada lote de probabilidad
+
+
+def _lotes_integral(funcion, generador, n, lim_inf, lim_sup, lote):
+    """Momentos de funcion(x) en n puntos uniformes de la caja (tarea de un proceso)."""
+    d = len(lim_inf)
+    acumulado = (0, 0.0, 0.0)
+    for ini in range(0, n, lote):
+        b = min(lote, n - ini)
+        x = lim_inf + generador.siguientes(b * d).reshape(b, d) * (lim_sup - lim_inf)
+        acumulado = _fusionar_momentos(acumulado, np.asarray(funcion(x), dtype=np.float64).reshape(b))
+    return acumulado
+
+
+def _lotes_evento(evento, especificaciones, generador, n, lote, inicio, fin):
+    """Cuenta ocurrencias del evento en los lotes [inicio, fin) (tarea de un proceso).
+
+    El lote i usa el subflujo i del generador, así el conteo no depende de
+    cómo se repartan los lotes entre procesos.
+    """
+    longitud = lote * len(especificaciones) * RESERVA_UNIFORMES
+    ocurrencias = 0
+    for i in range(inicio, fin):
+        b = min(lote, n - i * lote)
+        variables = GeneradorVariables(generador.subflujo(i, longitud))
+        muestras = {}
+        for nombre, espec in especificaciones.items():
+            distribucion, params, opciones = (tuple(espec) + ({},))[:3]
+            muestras[nombre] = np.asarray(getattr(variables, distribucion)(*params, b, **opciones))
+        ocurrencias += int(np.count_nonzero(evento(muestras)))
+    return ocurrencias
+
+
 class MonteCarlo:
     @staticmethod
-    def estimar_pi(n, generador: GeneradorLCG):
-        """Estimación de π usando Monte Carlo."""
-        dentro = 0
-        for _ in range(n):
-            x, y = generador.siguiente(), generador.siguiente()
-            if x**2 + y**2 <= 1:
-                dentro += 1
+    def estimar_pi(n, generador: GeneradorLCG, procesos=1):
+        """Estimación de π usando Monte Carlo.
+
+        Con procesos > 1 (None = todos los núcleos) los n puntos se reparten en
+        subflujos consecutivos del generador que se cuentan en un pool de procesos.
+        El generador puede ser un GeneradorLCG o una secuencia cuasi-aleatoria
+        bidimensional (SecuenciaHalton, SecuenciaSobol).
+        El resultado es idéntico al de la ejecución serial con la misma semilla
+        y el generador queda en el mismo estado.
+        """
+        procesos = _procesos(procesos, n)
+        if procesos == 1:
+            return 4 * _aciertos_circulo(generador, n) / n
+
+        # El tramo [ini, fin) empieza en el uniforme 2*ini de la secuencia.
+        tareas = [(generador.subflujo(ini, 2), fin - ini) for ini, fin in _cortes(n, procesos)]
+        dentro = sum(_repartir(_aciertos_circulo, tareas, procesos))
+        generador.saltar(2 * n)
         return 4 * dentro / n
+
+    METODOS_REDUCCION = ("acierto", "media_muestral", "antiteticas", "estratificado",
+                         "hipercubo_latino", "control")
+
+    @staticmethod
+    def estimar_pi_reducido(n, generador: GeneradorLCG, metodo="antiteticas"):
+        """Estimación de π con técnicas de reducción de varianza.
+
+        Todos los métodos gastan el mismo presupuesto que estimar_pi (2n
+        uniformes). factor_reduccion compara la varianza del estimador con la
+        del acierto/fallo (16 p(1 − p) por punto, p = π/4 estimado) al mismo
+        número de uniformes: un factor de 10 equivale a necesitar 10 veces
+        menos llamadas al generador para el mismo error.
+        """
+        estimacion, varianza, uniformes = _reduccion_varianza(metodo, int(n), generador)
+        p = min(max(estimacion / 4, 0.0), 1.0)
+        varianza_acierto = 16 * p * (1 - p) * 2 / uniformes
+        return {"metodo": metodo, "estimacion": float(estimacion),
+                "error_estandar": math.sqrt(varianza), "uniformes": uniformes,
+                "factor_reduccion": varianza_acierto / varianza if varianza > 0 else math.inf}
+
+    @staticmethod
+    def integrar(funcion, lim_inf, lim_sup, n, generador: GeneradorLCG, lote=TAMANO_BLOQUE, procesos=1):
+        """Integral de funcion sobre la caja [lim_inf, lim_sup] ⊂ Rᵈ por Monte Carlo.
+
+        funcion recibe un arreglo (b, d) y devuelve b valores; se evalúa por
+        lotes de `lote` puntos, así la memoria no depende de n. Con procesos > 1
+        los puntos se reparten en subflujos consecutivos (funcion debe poder
+        serializarse, p. ej. definida a nivel de módulo) y se usan exactamente
+        los mismos puntos que en la ejecución serial. Sirve cualquier generador
+        con la interfaz del LCG, incluidas las secuencias cuasi-aleatorias de
+        dimensión d; con ellas error_estandar (varianza muestral i.i.d.) no es
+        válido como medida del error.
+        Devuelve un diccionario con estimacion, error_estandar, n, segundos y
+        evaluaciones_por_segundo.
+        """
+        lim_inf = np.atleast_1d(np.asarray(lim_inf, dtype=np.float64))
+        lim_sup = np.atleast_1d(np.asarray(lim_sup, dtype=np.float64))
+        if lim_inf.shape != lim_sup.shape:
+            raise ValueError("lim_inf y lim_sup deben tener la misma dimension")
+        n, d = int(n), len(lim_inf)
+        if getattr(generador, "dimension", d) != d:
+            raise ValueError(f"El generador produce puntos de dimension {generador.dimension}, "
+                             f"pero la caja es de dimension {d}")
+        volumen = float(np.prod(lim_sup - lim_inf))
+        procesos = _procesos(procesos, n)
+        inicio = time.perf_counter()
+        tareas = [(funcion, generador.subflujo(ini, d), fin - ini, lim_inf, lim_sup, lote)
+                  for ini, fin in _cortes(n, procesos)]
+        _, media, m2 = reduce(_combinar_momentos, _repartir(_lotes_integral, tareas, procesos))
+        generador.saltar(n * d)
+        segundos = time.perf_counter() - inicio
+        varianza = m2 / (n - 1) if n > 1 else float("nan")
+        return {"estimacion": volumen * media, "error_estandar": volumen * math.sqrt(varianza / n), "n": n,
+                "segundos": segundos, "evaluaciones_por_segundo": n / segundos if segundos > 0 else math.inf}
+
+    @staticmethod
+    def probabilidad(evento, especificaciones, n, generador: GeneradorLCG, lote=TAMANO_BLOQUE, procesos=1):
+        """Probabilidad de un evento sobre variables simuladas con GeneradorVariables.
+
+        especificaciones asocia a cada nombre una tupla (distribucion, params[,
+        opciones]) con un método de GeneradorVariables, p. ej.
+        {"llegadas": ("poisson", (4,)), "servicio": ("normal", (1, 0.2), {"metodo": "ziggurat"})}.
+        evento recibe el diccionario nombre -> arreglo del lote y devuelve un
+        arreglo booleano. Cada lote usa su propio subflujo del LCG con
+        RESERVA_UNIFORMES uniformes por muestra y variable, de modo que el
+        resultado es el mismo con cualquier número de procesos.
+        Devuelve un diccionario con estimacion, error_estandar, n, segundos y
+        evaluaciones_por_segundo.
+        """
+        n = int(n)
+        lotes = -(-n // lote)
+        procesos = _procesos(procesos, lotes)
+        inicio = time.perf_counter()
+        tareas = [(evento, especificaciones, generador, n, lote, ini, fin) for ini, fin in _cortes(lotes, procesos)]
+        ocurrencias = sum(_repartir(_lotes_evento, tareas, procesos))
+        generador.saltar(lotes * lote * len(especificaciones) * RESERVA_UNIFORMES)
+        segundos = time.perf_counter() - inicio
+        p = ocurrencias / n
+        return {"estimacion": p, "error_estandar": math.sqrt(p * (1 - p) / n), "n": n,
+                "segundos": segundos, "evaluaciones_por_segundo": n / segundos if segundos > 0 else math.inf}
+
+    @staticmethod
+    def simular_pi(n, generador: GeneradorLCG, max_retenidos=100_000, resolucion=100,
+                   confianza=0.95, procesos=1):
+        """Estimación de π que conserva los puntos simulados para graficarlos.
+
+        En una sola pasada por bloques devuelve la estimación (idéntica a
+        estimar_pi con el mismo generador), una vista de a lo sumo
+        max_retenidos puntos tomados a paso fijo y la traza de convergencia
+        con `resolucion` controles, así la memoria no depende de n.
+        Con procesos > 1 los tramos se simulan en subflujos en paralelo.
+        Devuelve un diccionario con estimacion, n, x, y, dentro (puntos
+        retenidos), paso y traza (como traza_convergencia).
+        """
+        n = int(n)
+        paso = max(1, -(-n // int(max_retenidos)))
+        controles = _puntos_traza(n, resolucion)
+        procesos = _procesos(procesos, n)
+        tareas = [(generador.subflujo(ini, 2), ini, fin, paso, controles) for ini, fin in _cortes(n, procesos)]
+        tramos = _repartir(_simular_tramo, tareas, procesos)
+        generador.saltar(2 * n)
+        previos = np.cumsum([0] + [t[0] for t in tramos[:-1]])
+        conteos = np.concatenate([t[4] + base for t, base in zip(tramos, previos)])
+        dentro = sum(t[0] for t in tramos)
+        return {
+            "estimacion": 4 * dentro / n,
+            "n": n,
+            "x": np.concatenate([t[1] for t in tramos]),
+            "y": np.concatenate([t[2] for t in tramos]),
+            "dentro": np.concatenate([t[3] for t in tramos]),
+            "paso": paso,
+            "traza": _traza_desde_conteos(controles, conteos, confianza),
+        }
+
+    @staticmethod
+    def barrido_precision(escalas, replicas, generador: GeneradorLCG, procesos=1, progreso=None,
+                          anidado=False):
+        """Precisión de estimar_pi frente a la escala, con réplicas independientes.
+
+        En modo independiente cada par (escala, réplica) usa su propio tramo
+        consecutivo del generador. Con anidado=True cada réplica simula una sola
+        vez la mayor escala y lee las menores de sus conteos acumulados por
+        prefijo: el costo es O(max n) por réplica en lugar de O(Σ n), a cambio
+        de que las escalas de una misma réplica queden correlacionadas.
+        El resultado no depende de procesos. Los tramos se simulan en un pool
+        de procesos y progreso(fraccion) se llama cada vez que termina uno.
+        Devuelve un diccionario con n, estimaciones (escalas x réplicas),
+        estimacion_media, error_medio, desviacion y tasa_convergencia
+        (pendiente log-log del error medio; teórica -0.5).
+        """
+        escalas = np.unique(np.asarray(escalas, dtype=np.int64))
+        replicas = max(1, int(replicas))
+        if anidado:
+            tamanos = np.full(replicas, escalas[-1])
+            tarea, argumentos = _aciertos_prefijos, [escalas] * replicas
+        else:
+            tamanos = np.repeat(escalas, replicas)
+            tarea, argumentos = _aciertos_circulo, tamanos.tolist()
+        inicios = np.concatenate([[0], np.cumsum(tamanos)[:-1]])
+        tareas = [(generador.subflujo(int(ini), 2), arg) for ini, arg in zip(inicios, argumentos)]
+        aciertos = _repartir(tarea, tareas, _procesos(procesos, len(tareas)), progreso)
+        generador.saltar(2 * int(tamanos.sum()))
+        if anidado:
+            aciertos = np.array(aciertos).T
+        estimaciones = 4 * np.array(aciertos).reshape(len(escalas), replicas) / escalas[:, None]
+        error_medio = np.abs(estimaciones - np.pi).mean(axis=1)
+        tasa = float("nan")
+        if len(escalas) > 1 and np.all(error_medio > 0):
+            tasa = float(np.polyfit(np.log(escalas), np.log(error_medio), 1)[0])
+        return {
+            "n": escalas,
+            "estimaciones": estimaciones,
+            "estimacion_media": estimaciones.mean(axis=1),
+            "error_medio": error_medio,
+            "desviacion": estimaciones.std(axis=1, ddof=1) if replicas > 1 else np.zeros(len(escalas)),
+            "tasa_convergencia": tasa,
+        }
+
+    @staticmethod
+    def traza_convergencia(aciertos, resolucion=100, confianza=0.95):
+        """Estimación acumulada de π y su intervalo de confianza en una sola pasada.
+
+        aciertos es el arreglo booleano (punto dentro del círculo) en el orden
+        de simulación. Una suma acumulada da el conteo en cada prefijo y la
+        traza se submuestrea a `resolucion` puntos equiespaciados.
+        Devuelve un diccionario con n, estimacion, ic_inf e ic_sup (arreglos).
+        """
+        acumulado = np.cumsum(aciertos, dtype=np.int64)
+        n = _puntos_traza(len(acumulado), resolucion)
+        return _traza_desde_conteos(n, acumulado[n - 1], confianza)
+
+    @staticmethod
+    def estimar_pi_adaptativo(generador: GeneradorLCG, tolerancia=1e-3, confianza=0.95,
+                              lote=1024, tiempo_max=None, n_max=None):
+        """Estimación de π con regla de parada por precisión objetivo.
+
+        Simula por lotes vectorizados y mantiene la varianza del indicador de
+        acierto (Bernoulli). Se detiene cuando el semiancho del intervalo de
+        confianza es <= tolerancia, al agotar tiempo_max segundos o al llegar
+        a n_max puntos. Empieza con un lote piloto de `lote` puntos y tras cada
+        lote proyecta los que faltan para la tolerancia, de modo que no se
+        simula más de lo necesario.
+        Devuelve un diccionario con estimacion, ic, semiancho, n, segundos y
+        motivo ("tolerancia", "tiempo" o "n_max").
+        """
+        if tolerancia <= 0:
+            raise ValueError("La tolerancia debe ser positiva")
+        z = float(norm.ppf(0.5 + confianza / 2))
+        lote = max(2, int(lote))
+        inicio = time.perf_counter()
+        n = dentro = 0
+        siguiente = lote
+        while True:
+            if n_max is not None:
+                siguiente = min(siguiente, int(n_max) - n)
+            dentro += _aciertos_circulo(generador, siguiente)
+            n += siguiente
+            p = dentro / n
+            # Piso de varianza: si todos los puntos aciertan (o fallan) el
+            # semiancho de Wald sería 0 y la parada sería prematura.
+            varianza = max(p * (1 - p) * n / (n - 1), 1 / n)
+            semiancho = 4 * z * math.sqrt(varianza / n)
+            segundos = time.perf_counter() - inicio
+            if semiancho <= tolerancia:
+                motivo = "tolerancia"
+            elif n_max is not None and n >= n_max:
+                motivo = "n_max"
+            elif tiempo_max is not None and segundos >= tiempo_max:
+                motivo = "tiempo"
+            else:
+                # Con la varianza actual, n_total = (4 z σ / tolerancia)².
+                requeridos = (4 * z / tolerancia) ** 2 * varianza
+                siguiente = int(min(max(requeridos - n, lote), ELEMENTOS_POR_BLOQUE))
+                continue
+            estimacion = 4 * p
+            return {"estimacion": estimacion, "ic": (estimacion - semiancho, estimacion + semiancho),
+                    "semiancho": semiancho, "n": n, "segundos": segundos, "motivo": motivo}
+
+
+# =========================================================
+# 5️⃣ EXPORTACIÓN DE DATOS
+# =========================================================
+def _pyarrow():
+    """Importa pyarrow bajo demanda (dependencia opcional de Parquet/Feather)."""
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError as exc:
+        raise ImportError("Los formatos parquet y feather requieren pyarrow") from exc
+    return pyarrow
+
+
+def _detectar_formato(fuente, formato=None):
+    """Formato por extensión del nombre o, si no la hay, por la firma del archivo."""
+    if formato:
+        return formato
+    nombre = str(fuente) if isinstance(fuente, (str, os.PathLike)) else getattr(fuente, "name", "")
+    extension = os.path.splitext(str(nombre).lower())[1].lstrip(".")
+    if extension in ExportadorDatos.FORMATOS:
+        return extension
+    if isinstance(fuente, (str, os.PathLike)):
+        with open(fuente, "rb") as archivo:
+            firma = archivo.read(8)
+    else:
+        posicion = fuente.tell()
+        firma = fuente.read(8)
+        fuente.seek(posicion)
+    for prefijo, formato in ((b"\x93NUMPY", "npy"), (b"PAR1", "parquet"), (b"ARROW1", "feather")):
+        if firma.startswith(prefijo):
+            return formato
+    return "txt"
+
+
+class ExportadorDatos:
+    FORMATOS_TEXTO = ("csv", "txt")
+    FORMATOS_BINARIOS = ("npy", "parquet", "feather")
+    FORMATOS = FORMATOS_TEXTO + FORMATOS_BINARIOS
+    COLUMNA = "Valor_Simulado"
+    CLAVE_METADATOS = b"simulacion"
+
+    @staticmethod
+    def formatos_disponibles():
+        """Formatos de exportación utilizables con las dependencias instaladas."""
+        try:
+            _pyarrow()
+        except ImportError:
+            return ExportadorDatos.FORMATOS_TEXTO + ("npy",)
+        return ExportadorDatos.FORMATOS
+
+    @staticmethod
+    def metadatos(distribucion, params, n, generador: GeneradorLCG, tamano_bloque=2**20,
+                  vectorizado=True, **opciones):
+        """Metadatos de auditoría; debe llamarse antes de generar, con el generador en su estado inicial."""
+        return {
+            "distribucion": distribucion,
+            "parametros": [float(p) for p in params],
+            "opciones": opciones,
+            "n": int(n),
+            "semilla": int(generador.semilla),
+            "lcg": {"a": generador.a, "c": generador.c, "m": generador.m},
+            "tamano_bloque": int(tamano_bloque),
+            "vectorizado": bool(vectorizado),
+        }
+
+    @staticmethod
+    def regenerar(metadatos):
+        """Vuelve a generar el conjunto de datos descrito por sus metadatos (auditoría)."""
+        generador = GeneradorLCG(metadatos["semilla"], **metadatos["lcg"])
+        bloques = GeneradorVariables(generador, metadatos.get("vectorizado", True)).bloques(
+            metadatos["distribucion"], metadatos["parametros"], metadatos["n"],
+            metadatos["tamano_bloque"], **metadatos["opciones"])
+        return np.concatenate(list(bloques)) if metadatos["n"] else np.empty(0)
+
+    @staticmethod
+    def exportar_flujo(bloques, destino, formato, n=None, progreso=None, metadatos=None):
+        """Escribe bloques de datos de forma incremental (memoria constante).
+
+        destino es una ruta o un archivo binario abierto. El formato "npy"
+        necesita el total de registros n para escribir la cabecera; sus
+        metadatos se guardan en un archivo JSON adjunto (ruta + ".json").
+        Parquet y Feather (requieren pyarrow) los llevan en el esquema.
+        progreso, si se indica, recibe la fracción completada tras cada bloque.
+        Devuelve un resumen con registros, bytes y velocidad de escritura.
+        """
+        if formato not in ExportadorDatos.FORMATOS:
+            raise ValueError(f"Formato no soportado: {formato}")
+        if formato == "npy" and n is None:
+            raise ValueError("El formato npy requiere conocer n")
+        pa = _pyarrow() if formato in ("parquet", "feather") else None
+        propio = isinstance(destino, (str, os.PathLike))
+        archivo = open(destino, "wb") if propio else destino
+        inicio, registros, posicion = time.perf_counter(), 0, archivo.tell()
+        escritor = None
+        try:
+            if formato == "csv":
+                archivo.write(f"{ExportadorDatos.COLUMNA}\n".encode())
+            for bloque in bloques:
+                if formato == "npy":
+                    if registros == 0:
+                        cabecera = {"descr": np.lib.format.dtype_to_descr(bloque.dtype),
+                                    "fortran_order": False, "shape": (n,)}
+                        np.lib.format.write_array_header_1_0(archivo, cabecera)
+                    archivo.write(np.ascontiguousarray(bloque).tobytes())
+                elif pa is not None:
+                    if escritor is None:
+                        escritor = ExportadorDatos._escritor_arrow(pa, archivo, formato, bloque.dtype, metadatos)
+                    lote = pa.record_batch([pa.array(bloque)], names=[ExportadorDatos.COLUMNA])
+                    escritor.write_batch(lote)
+                else:
+                    archivo.write(("\n".join(map(repr, bloque.tolist())) + "\n").encode())
+                registros += len(bloque)
+                if progreso is not None and n:
+                    progreso(min(registros / n, 1.0))
+            if pa is not None:
+                if escritor is None:
+                    escritor = ExportadorDatos._escritor_arrow(pa, archivo, formato, np.float64, metadatos)
+                escritor.close()
+            escritos = archivo.tell() - posicion
+        finally:
+            if propio:
+                archivo.close()
+        if formato == "npy" and registros != n:
+            raise ValueError(f"Se esperaban {n} registros y se escribieron {registros}")
+        if formato == "npy" and metadatos is not None and propio:
+            with open(f"{destino}.json", "w", encoding="utf-8") as adjunto:
+                json.dump(metadatos, adjunto, indent=2)
+        segundos = time.perf_counter() - inicio
+        return {
+            "registros": registros,
+            "bytes": escritos,
+            "segundos": segundos,
+            "registros_por_segundo": registros / segundos if segundos > 0 else float("inf"),
+        }
+
+    @staticmethod
+    def _escritor_arrow(pa, archivo, formato, dtype, metadatos):
+        esquema = pa.schema(
+            [(ExportadorDatos.COLUMNA, pa.from_numpy_dtype(np.dtype(dtype)))],
+            metadata={ExportadorDatos.CLAVE_METADATOS: json.dumps(metadatos or {})})
+        if formato == "parquet":
+            return pa.parquet.ParquetWriter(archivo, esquema)
+        return pa.ipc.new_file(archivo, esquema)
+
+    @staticmethod
+    def cargar_binario(fuente, formato=None):
+        """Carga un archivo npy, parquet o feather y devuelve (datos, metadatos).
+
+        Con una ruta, npy y feather se abren mapeados en memoria (sin copia).
+        """
+        formato = _detectar_formato(fuente, formato)
+        es_ruta = isinstance(fuente, (str, os.PathLike))
+        metadatos = {}
+        if formato == "npy":
+            datos = np.load(fuente, mmap_mode="r" if es_ruta else None)
+            if es_ruta and os.path.exists(f"{fuente}.json"):
+                with open(f"{fuente}.json", encoding="utf-8") as adjunto:
+                    metadatos = json.load(adjunto)
+            return datos, metadatos
+        if formato not in ("parquet", "feather"):
+            raise ValueError(f"Formato binario no soportado: {formato}")
+        pa = _pyarrow()
+        if formato == "parquet":
+            tabla = pa.parquet.read_table(fuente)
+        else:
+            origen = pa.memory_map(str(fuente)) if es_ruta else fuente
+            tabla = pa.ipc.open_file(origen).read_all()
+        crudos = (tabla.schema.metadata or {}).get(ExportadorDatos.CLAVE_METADATOS)
+        if crudos:
+            metadatos = json.loads(crudos)
+        columna = tabla.column(0)
+        columna = columna.chunk(0) if columna.num_chunks == 1 else columna.combine_chunks()
+        return columna.to_numpy(zero_copy_only=False), metadatos
+
+
+# =========================================================
+# 6️⃣ INGESTA DE DATOS
+# =========================================================
+class IngestaDatos:
+    TAMANO_BLOQUE = 2**20
+    LIMITE_MEMORIA = 256 * 2**20
+
+    @staticmethod
+    def cargar(fuente, formato=None, limite_memoria=LIMITE_MEMORIA, directorio=None):
+        """Carga datos numéricos en una sola pasada y devuelve (datos, informe).
+
+        Detecta el formato (txt, csv, npy, parquet, feather). Los textos se
+        leen por bloques: mientras caben en limite_memoria se acumulan en RAM
+        y, si lo superan, se vuelcan a un archivo temporal que se devuelve
+        como np.memmap, de modo que el tamaño del archivo no está limitado por
+        la memoria. En CSV (coma o punto y coma) se usa la primera columna; en
+        texto separado por espacios se leen todos los campos fila por fila,
+        como np.loadtxt(...).ravel(). Una cabecera no numérica se omite.
+        El informe incluye registros, bytes, segundos y velocidad de lectura.
+        """
+        inicio = time.perf_counter()
+        formato = _detectar_formato(fuente, formato)
+        es_ruta = isinstance(fuente, (str, os.PathLike))
+        metadatos = {}
+        if formato in ExportadorDatos.FORMATOS_BINARIOS:
+            datos, metadatos = ExportadorDatos.cargar_binario(fuente, formato)
+            mapeado = isinstance(datos, np.memmap)
+        else:
+            datos, mapeado = IngestaDatos._leer_texto(fuente, limite_memoria, directorio)
+        if es_ruta:
+            tamano = os.path.getsize(fuente)
+        elif hasattr(fuente, "getbuffer"):
+            tamano = fuente.getbuffer().nbytes
+        else:
+            tamano = datos.nbytes
+        segundos = time.perf_counter() - inicio
+        informe = {
+            "formato": formato,
+            "registros": len(datos),
+            "bytes": tamano,
+            "segundos": segundos,
+            "mb_por_segundo": tamano / 2**20 / segundos if segundos > 0 else float("inf"),
+            "registros_por_segundo": len(datos) / segundos if segundos > 0 else float("inf"),
+            "mapeado": mapeado,
+            "metadatos": metadatos,
+        }
+        return datos, informe
+
+    @staticmethod
+    def _leer_texto(fuente, limite_memoria, directorio):
+        es_ruta = isinstance(fuente, (str, os.PathLike))
+        archivo = open(fuente, "rb") if es_ruta else fuente
+        try:
+            if not es_ruta:
+                archivo.seek(0)
+            posicion = archivo.tell()
+            primera = b""
+            while not primera.strip():
+                linea = archivo.readline()
+                if not linea:
+                    break
+                primera = linea
+            archivo.seek(posicion)
+            primera = primera.decode("utf-8", errors="replace").strip()
+            separador = "," if "," in primera else ";" if ";" in primera else r"\s+"
+            campos = [c for c in re.split(separador, primera) if c]
+            if len(campos) == 1:
+                separador = ","  # una sola columna: el separador más rápido del lector C
+            todos = separador == r"\s+"
+            try:
+                float(campos[0])
+                cabecera = None
+            except (ValueError, IndexError):
+                cabecera = 0
+            lector = pd.read_csv(archivo, sep=separador, header=cabecera, usecols=None if todos else [0],
+                                 dtype=np.float64, chunksize=IngestaDatos.TAMANO_BLOQUE,
+                                 skip_blank_lines=True, engine="c", float_precision="round_trip")
+            bloques, en_memoria, volcado = [], 0, None
+            try:
+                for trozo in lector:
+                    if todos:
+                        bloque = trozo.to_numpy().ravel()
+                        if np.isnan(bloque).any():
+                            raise ValueError("Las filas del archivo no tienen todas el mismo numero de campos")
+                    else:
+                        bloque = trozo.iloc[:, 0].to_numpy()
+                    if volcado is None and en_memoria + bloque.nbytes > limite_memoria:
+                        volcado = tempfile.NamedTemporaryFile(suffix=".f64", dir=directorio, delete=False)
+                        for previo in bloques:
+                            volcado.write(previo.tobytes())
+                        bloques = []
+                    if volcado is None:
+                        bloques.append(bloque)
+                        en_memoria += bloque.nbytes
+                    else:
+                        volcado.write(bloque.tobytes())
+            except BaseException:
+                if volcado is not None:
+                    volcado.close()
+                    os.unlink(volcado.name)
+                raise
+        finally:
+            if es_ruta:
+                archivo.close()
+        if volcado is None:
+            return (np.concatenate(bloques) if bloques else np.empty(0)), False
+        volcado.close()
+        datos = np.memmap(volcado.name, dtype=np.float64, mode="r")
+        try:
+            os.unlink(volcado.name)  # el mapeo mantiene vivo el archivo (POSIX)
+        except OSError:
+            pass
+        return datos, True
+
+
+# =========================================================
+# 7️⃣ BOOTSTRAP NO PARAMÉTRICO
+# =========================================================
+MAX_JACKKNIFE = 1000
+
+
+def _estadistico_muestra(x, estadistico, q):
+    """Valor del estadístico sobre una muestra completa (sin remuestrear)."""
+    if estadistico == "media":
+        return float(np.mean(x))
+    if estadistico == "varianza":
+        return float(np.var(x))
+    if estadistico == "desviacion":
+        return float(np.std(x))
+    if estadistico in ("mediana", "cuantil"):
+        return float(np.quantile(x, 0.5 if estadistico == "mediana" else q))
+    return float(estadistico(x))
+
+
+def _estadistico_remuestras(xs, indices, estadistico, q):
+    """Estadístico de cada fila de índices sobre los datos ordenados xs.
+
+    Media, varianza y desviación se reducen por filas sobre los valores
+    indexados (el bloque de índices ya acota la memoria). Los cuantiles salen
+    de los estadísticos de orden de los índices, que coinciden con los de los
+    valores porque xs está ordenado, sin copiar los datos remuestreados.
+    """
+    n = indices.shape[1]
+    if estadistico == "media":
+        return xs[indices].mean(axis=1)
+    if estadistico in ("varianza", "desviacion"):
+        varianza = xs[indices].var(axis=1)
+        return varianza if estadistico == "varianza" else np.sqrt(varianza)
+    if estadistico in ("mediana", "cuantil"):
+        h = (0.5 if estadistico == "mediana" else q) * (n - 1)
+        lo = int(math.floor(h))
+        hi = min(lo + 1, n - 1)
+        parcial = np.partition(indices, [lo, hi], axis=1)
+        a, b = xs[parcial[:, lo]], xs[parcial[:, hi]]
+        return a + (h - lo) * (b - a)
+    return np.array([estadistico(xs[fila]) for fila in indices])
+
+
+def _replicas_bootstrap(xs, estadistico, q, semilla, a, c, m, inicio, fin):
+    """Réplicas bootstrap [inicio, fin) (tarea de un proceso); la réplica r usa el subflujo r."""
+    n = len(xs)
+    filas = max(1, ELEMENTOS_POR_BLOQUE // n)
+    base = GeneradorLCG(semilla, a, c, m)
+    salida = np.empty(fin - inicio)
+    for r0 in range(inicio, fin, filas):
+        r1 = min(fin, r0 + filas)
+        u = base.subflujo(r0, n).siguientes((r1 - r0) * n)
+        indices = (u * n).astype(np.int64).reshape(r1 - r0, n)
+        salida[r0 - inicio:r1 - inicio] = _estadistico_remuestras(xs, indices, estadistico, q)
+    return salida
+
+
+def _jackknife(xs, estadistico, q):
+    """Valores leave-one-out del estadístico (agrupados si n > MAX_JACKKNIFE)."""
+    n = len(xs)
+    if estadistico in ("media", "varianza", "desviacion"):
+        xc = xs - xs.mean()
+        s1, s2 = xc.sum(), (xc * xc).sum()
+        medias = (s1 - xc) / (n - 1)
+        if estadistico == "media":
+            return medias + xs.mean()
+        varianzas = np.maximum((s2 - xc * xc) / (n - 1) - medias**2, 0)
+        return varianzas if estadistico == "varianza" else np.sqrt(varianzas)
+    if estadistico in ("mediana", "cuantil"):
+        # Al quitar el elemento j de xs ordenado, la posición k pasa a ser xs[k] (j > k) o xs[k + 1]
+        h = (0.5 if estadistico == "mediana" else q) * (n - 2)
+        lo = int(math.floor(h))
+        hi = min(lo + 1, n - 2)
+        j = np.arange(n)
+        a = np.where(j > lo, xs[lo], xs[lo + 1])
+        b = np.where(j > hi, xs[hi], xs[hi + 1])
+        return a + (h - lo) * (b - a)
+    grupos = min(n, MAX_JACKKNIFE)
+    etiquetas = np.arange(n) % grupos
+    return np.array([estadistico(xs[etiquetas != g]) for g in range(grupos)])
+
+
+class Bootstrap:
+    ESTADISTICOS = ("media", "varianza", "desviacion", "mediana", "cuantil")
+    METODOS = ("percentil", "basico", "bca")
+
+    @staticmethod
+    def replicas(datos, estadistico, generador: GeneradorLCG, B=2000, procesos=1, q=0.5):
+        """B réplicas bootstrap del estadístico.
+
+        estadistico es uno de Bootstrap.ESTADISTICOS (con ruta rápida) o una
+        función de un arreglo 1D (debe poder serializarse si procesos > 1).
+        Los índices de remuestreo salen del LCG por bloques de memoria acotada;
+        la réplica r usa el subflujo r, así el resultado no depende de procesos.
+        """
+        xs = np.sort(np.asarray(datos, dtype=np.float64))
+        n = len(xs)
+        procesos = _procesos(procesos, B)
+        base = (xs, estadistico, q, generador.semilla, generador.a, generador.c, generador.m)
+        salida = np.concatenate(_repartir(_replicas_bootstrap, [base + tramo for tramo in _cortes(B, procesos)],
+                                          procesos))
+        generador.saltar(B * n)
+        return salida
+
+    @staticmethod
+    def intervalo(datos, estadistico, generador: GeneradorLCG, B=2000, nivel=0.95,
+                  metodos=METODOS, procesos=1, q=0.5):
+        """Intervalos de confianza bootstrap (percentil, básico y BCa) a partir de las mismas réplicas.
+
+        Devuelve un diccionario con la estimación, el error estándar y el sesgo
+        bootstrap, y en "intervalos" el par (inferior, superior) de cada método.
+        """
+        xs = np.sort(np.asarray(datos, dtype=np.float64))
+        theta = _estadistico_muestra(xs, estadistico, q)
+        replicas = Bootstrap.replicas(xs, estadistico, generador, B, procesos, q)
+        alfa = (1 - nivel) / 2
+        intervalos = {}
+        for metodo in metodos:
+            if metodo == "percentil":
+                inferior, superior = np.quantile(replicas, [alfa, 1 - alfa])
+            elif metodo == "basico":
+                q_inf, q_sup = np.quantile(replicas, [alfa, 1 - alfa])
+                inferior, superior = 2 * theta - q_sup, 2 * theta - q_inf
+            elif metodo == "bca":
+                proporcion = np.clip(np.mean(replicas < theta), 1 / (B + 1), B / (B + 1))
+                z0 = ndtri(proporcion)
+                jack = _jackknife(xs, estadistico, q)
+                d = jack.mean() - jack
+                denominador = 6 * np.sum(d**2) ** 1.5
+                acel = np.sum(d**3) / denominador if denominador > 0 else 0.0
+                z = ndtri(np.array([alfa, 1 - alfa]))
+                ajustados = ndtr(z0 + (z0 + z) / (1 - acel * (z0 + z)))
+                inferior, superior = np.quantile(replicas, ajustados)
+            else:
+                raise ValueError(f"Metodo no soportado: {metodo}")
+            intervalos[metodo] = (float(inferior), float(superior))
+        return {
+            "estimacion": theta,
+            "error_estandar": float(np.std(replicas, ddof=1)),
+            "sesgo": float(np.mean(replicas) - theta),
+            "B": B,
+            "nivel": nivel,
+            "intervalos": intervalos,
+        }
+
+
+# =========================================================
+# 8️⃣ SECUENCIAS DE BAJA DISCREPANCIA (CUASI-MONTE CARLO)
+# =========================================================
+BITS_SOBOL = 32
+
+# Números de dirección de Joe y Kuo (new-joe-kuo-6.21201) para las dimensiones
+# 2 a 21: (grado s, coeficientes a, m_1..m_s). La dimensión 1 es van der Corput.
+DIRECCIONES_SOBOL = (
+    (1, 0, (1,)),
+    (2, 1, (1, 3)),
+    (3, 1, (1, 3, 1)),
+    (3, 2, (1, 1, 1)),
+    (4, 1, (1, 1, 3, 3)),
+    (4, 4, (1, 3, 5, 13)),
+    (5, 2, (1, 1, 5, 5, 17)),
+    (5, 4, (1, 1, 5, 5, 5)),
+    (5, 7, (1, 1, 7, 11, 19)),
+    (5, 11, (1, 1, 5, 1, 1)),
+    (5, 13, (1, 1, 1, 3, 11)),
+    (5, 14, (1, 3, 5, 5, 31)),
+    (6, 1, (1, 3, 3, 9, 7, 49)),
+    (6, 13, (1, 1, 1, 15, 21, 21)),
+    (6, 16, (1, 3, 1, 13, 27, 49)),
+    (6, 19, (1, 1, 1, 15, 7, 5)),
+    (6, 22, (1, 3, 1, 15, 13, 25)),
+    (6, 25, (1, 1, 5, 5, 19, 61)),
+    (7, 1, (1, 3, 7, 11, 23, 15, 103)),
+    (7, 4, (1, 3, 7, 13, 13, 15, 69)),
+)
+
+
+def _primos(k):
+    """Los k primeros números primos."""
+    primos, candidato = [], 2
+    while len(primos) < k:
+        if all(candidato % p for p in primos if p * p <= candidato):
+            primos.append(candidato)
+        candidato += 1
+    return primos
+
+
+def _direcciones_sobol(dimension):
+    """Matriz (dimension, BITS_SOBOL) de números de dirección V_k = m_k · 2^(BITS-k)."""
+    if dimension > len(DIRECCIONES_SOBOL) + 1:
+        raise ValueError(f"Sobol soporta hasta {len(DIRECCIONES_SOBOL) + 1} dimensiones")
+    V = np.zeros((dimension, BITS_SOBOL), dtype=np.uint64)
+    V[0] = [1 << (BITS_SOBOL - k) for k in range(1, BITS_SOBOL + 1)]
+    for d, (grado, a, iniciales) in enumerate(DIRECCIONES_SOBOL[:dimension - 1], start=1):
+        m = list(iniciales)
+        for k in range(grado, BITS_SOBOL):
+            nuevo = m[k - grado] ^ (m[k - grado] << grado)
+            for j in range(1, grado):
+                if (a >> (grado - 1 - j)) & 1:
+                    nuevo ^= m[k - j] << j
+            m.append(nuevo)
+        V[d] = [m[k] << (BITS_SOBOL - 1 - k) for k in range(BITS_SOBOL)]
+    return V
+
+
+class _SecuenciaCuasiAleatoria:
+    """Base común: índice de la secuencia e interfaz compatible con GeneradorLCG.
+
+    siguientes(k) devuelve las coordenadas de los puntos consecutivos aplanadas
+    por filas (x₁, y₁, x₂, y₂, ...), que es como MonteCarlo consume pares del
+    LCG; saltar y subflujo cuentan posiciones en coordenadas, igual que el LCG.
+    """
+
+    def __init__(self, dimension=2, aleatorizar=True, semilla=12345, indice=0):
+        self.dimension = int(dimension)
+        self.aleatorizar = aleatorizar
+        self.semilla = semilla
+        self.indice = int(indice)
+
+    def _puntos(self, indices):
+        raise NotImplementedError
+
+    def puntos(self, n):
+        """Devuelve los n puntos siguientes como un arreglo (n, dimension)."""
+        indices = np.arange(self.indice, self.indice + int(n), dtype=np.uint64)
+        self.indice += int(n)
+        return self._puntos(indices)
+
+    def siguientes(self, n):
+        """Las n coordenadas siguientes; si n no es múltiplo de la dimensión se descarta el resto del último punto."""
+        n = int(n)
+        return self.puntos(-(-n // self.dimension)).ravel()[:n]
+
+    def siguiente(self):
+        return float(self.siguientes(1)[0])
+
+    def saltar(self, k):
+        """Avanza la secuencia k coordenadas (k / dimension puntos) sin generarlas."""
+        self.indice += -(-int(k) // self.dimension)
+        return self
+
+    def subflujo(self, i, longitud):
+        """Copia que comienza en la coordenada i*longitud; comparte la aleatorización."""
+        return copy.copy(self).saltar(i * longitud)
+
+
+class SecuenciaHalton(_SecuenciaCuasiAleatoria):
+    """Secuencia de Halton con bases primas y aleatorización por permutación de dígitos.
+
+    Con aleatorizar=True cada dimensión y cada nivel de dígito usa una
+    permutación aleatoria de {0, ..., b-1} obtenida del LCG con la semilla dada.
+    """
+
+    PRECISION_BITS = 40
+
+    def __init__(self, dimension=2, aleatorizar=True, semilla=12345, indice=0):
+        super().__init__(dimension, aleatorizar, semilla, indice)
+        self.bases = _primos(self.dimension)
+        self.permutaciones = None
+        if aleatorizar:
+            lcg = GeneradorLCG(semilla)
+            self.permutaciones = [
+                [np.argsort(lcg.siguientes(b)) for _ in range(math.ceil(self.PRECISION_BITS / math.log2(b)))]
+                for b in self.bases
+            ]
+
+    def _puntos(self, indices):
+        salida = np.empty((len(indices), self.dimension))
+        for d, base in enumerate(self.bases):
+            k = indices.astype(np.int64)
+            x = np.zeros(len(k))
+            factor = 1.0 / base
+            if self.permutaciones is None:
+                while np.any(k):
+                    x += (k % base) * factor
+                    k //= base
+                    factor /= base
+            else:
+                for perm in self.permutaciones[d]:
+                    x += perm[k % base] * factor
+                    k //= base
+                    factor /= base
+            salida[:, d] = x
+        return salida
+
+
+class SecuenciaSobol(_SecuenciaCuasiAleatoria):
+    """Secuencia de Sobol (orden de código Gray) con números de dirección de Joe-Kuo.
+
+    Con aleatorizar=True aplica el scrambling lineal matricial más un
+    desplazamiento digital aleatorio (LMS + shift), generados con el LCG.
+    Cada punto se calcula directamente desde su índice, así que saltar es O(1).
+    """
+
+    def __init__(self, dimension=2, aleatorizar=True, semilla=12345, indice=0):
+        super().__init__(dimension, aleatorizar, semilla, indice)
+        V = _direcciones_sobol(self.dimension)
+        self.desplazamiento = np.zeros(self.dimension, dtype=np.uint64)
+        if aleatorizar:
+            lcg = GeneradorLCG(semilla)
+            for d in range(self.dimension):
+                # Fila r de la matriz triangular inferior (diagonal unitaria) como máscara de bits.
+                azar = lcg.siguientes(BITS_SOBOL * BITS_SOBOL).reshape(BITS_SOBOL, BITS_SOBOL) < 0.5
+                filas = []
+                for r in range(BITS_SOBOL):
+                    mascara = 1 << (BITS_SOBOL - 1 - r)
+                    for t in range(r):
+                        if azar[r, t]:
+                            mascara |= 1 << (BITS_SOBOL - 1 - t)
+                    filas.append(mascara)
+                for k in range(BITS_SOBOL):
+                    v = int(V[d, k])
+                    V[d, k] = sum(1 << (BITS_SOBOL - 1 - r)
+                                  for r, mascara in enumerate(filas) if bin(mascara & v).count("1") & 1)
+            self.desplazamiento = (lcg.siguientes(self.dimension) * 2**BITS_SOBOL).astype(np.uint64)
+        self.direcciones = V
+
+    def _puntos(self, indices):
+        if len(indices) and int(indices[-1]) >= 2**BITS_SOBOL:
+            raise ValueError(f"La secuencia de Sobol admite a lo sumo 2**{BITS_SOBOL} puntos")
+        gray = indices ^ (indices >> np.uint64(1))
+        enteros = np.broadcast_to(self.desplazamiento, (len(indices), self.dimension)).copy()
+        for k in range(BITS_SOBOL):
+            restantes = gray >> np.uint64(k)
+            if not restantes.any():
+                break  # ningún índice del lote tiene bits de orden >= k
+            activo = (restantes & np.uint64(1)).astype(bool)
+            enteros[activo] ^= self.direcciones[:, k]
+        return enteros / 2.0**BITS_SOBOL
@@ -0,0 +1,269 @@
+import io
+import math
+import tracemalloc
+
+import numpy as np
+import pytest
+from scipy import stats
+from scipy.stats import qmc
+
+from simulacion_core import (Bootstrap, ExportadorDatos, GeneradorLCG, GeneradorVariables, IngestaDatos,
+                             MonteCarlo, MuestreadorAlias, PruebasAjuste, SecuenciaHalton, SecuenciaSobol)
+
+
+def _iguales(a, b):
+    """Igualdad bit a bit de resultados anidados (dict, tuple, arreglos, escalares)."""
+    if isinstance(a, dict):
+        return a.keys() == b.keys() and all(_iguales(a[k], b[k]) for k in a)
+    if isinstance(a, (tuple, list)):
+        return len(a) == len(b) and all(_iguales(x, y) for x, y in zip(a, b))
+    return np.array_equal(a, b, equal_nan=True)
+
+
+def _serie_y_paralelo(motor, procesos=2):
+    """Ejecuta motor(generador, procesos) en serie y en paralelo y exige el mismo resultado y estado final."""
+    serie, paralelo = GeneradorLCG(7), GeneradorLCG(7)
+    assert _iguales(motor(serie, 1), motor(paralelo, procesos))
+    assert serie.semilla == paralelo.semilla
+
+
+def test_simular_pi_memoria_acotada_por_retenidos():
+    # Las vistas a paso fijo no deben retener los bloques completos de uniformes.
+    tracemalloc.start()
+    MonteCarlo.simular_pi(4_000_000, GeneradorLCG(1), max_retenidos=1000)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert pico < 16 * 2**20
+
+
+def test_integrar_rechaza_secuencia_de_otra_dimension():
+    with pytest.raises(ValueError):
+        MonteCarlo.integrar(lambda x: np.prod(x, axis=1), [0] * 3, [1] * 3, 1024, SecuenciaSobol(2))
+    resultado = MonteCarlo.integrar(lambda x: np.prod(x, axis=1), [0] * 3, [1] * 3, 2**14, SecuenciaSobol(3))
+    assert abs(resultado["estimacion"] - 0.125) < 1e-3
+
+
+def test_adaptativo_no_se_detiene_con_lote_degenerado():
+    resultado = MonteCarlo.estimar_pi_adaptativo(GeneradorLCG(1), 1e-3, lote=2, n_max=10**6)
+    assert resultado["n"] > 2 and resultado["semiancho"] > 0
+
+
+def test_adaptativo_ajusta_el_costo_a_la_tolerancia():
+    resultado = MonteCarlo.estimar_pi_adaptativo(GeneradorLCG(1), 0.1)
+    assert resultado["motivo"] == "tolerancia"
+    assert resultado["n"] < 4 * 1024
+
+
+def test_evaluar_lote_ordena_por_aic_y_omite_series_vacias():
+    variables = GeneradorVariables(GeneradorLCG(2))
+    tabla = PruebasAjuste.evaluar_lote({"vacia": [], "exp": variables.exponencial(2, 2000)})
+    assert {fila["conjunto"] for fila in tabla} == {"exp"}
+    assert [fila["aic"] for fila in tabla] == sorted(fila["aic"] for fila in tabla)
+    assert tabla[0]["familia"] == "exponencial"
+
+
+@pytest.mark.parametrize("n", [0, 1, 7, 5000])
+def test_siguientes_coincide_con_llamadas_sucesivas(n):
+    vectorizado, escalar = GeneradorLCG(2024), GeneradorLCG(2024)
+    assert np.array_equal(vectorizado.siguientes(n), [escalar.siguiente() for _ in range(n)])
+    assert vectorizado.semilla == escalar.semilla
+
+
+@pytest.mark.parametrize("k", [0, 1, 12345, 2**20 + 3])
+def test_saltar_equivale_a_k_pasos(k):
+    saltado, paso_a_paso = GeneradorLCG(99), GeneradorLCG(99)
+    saltado.saltar(k)
+    paso_a_paso.siguientes(k)
+    assert saltado.semilla == paso_a_paso.semilla
+
+
+def test_subflujo_comienza_en_su_posicion():
+    base = GeneradorLCG(99)
+    secuencia = GeneradorLCG(99).siguientes(3 * 1000)
+    assert np.array_equal(base.subflujo(2, 1000).siguientes(1000), secuencia[2000:])
+    assert base.semilla == 99
+
+
+def test_estimar_pi_no_depende_de_procesos():
+    _serie_y_paralelo(lambda g, p: MonteCarlo.estimar_pi(200_001, g, procesos=p))
+
+
+def _box_muller_original(generador, mu, sigma, n):
+    """Box-Muller escalar tal como estaba antes del backend vectorizado."""
+    datos = []
+    for _ in range(n // 2):
+        u1, u2 = generador.siguiente(), generador.siguiente()
+        z1 = math.sqrt(-2 * math.log(u1)) * math.cos(2 * math.pi * u2)
+        z2 = math.sqrt(-2 * math.log(u1)) * math.sin(2 * math.pi * u2)
+        datos.append(mu + sigma * z1)
+        datos.append(mu + sigma * z2)
+    if n % 2 != 0:
+        u1, u2 = generador.siguiente(), generador.siguiente()
+        z1 = math.sqrt(-2 * math.log(u1)) * math.cos(2 * math.pi * u2)
+        datos.append(mu + sigma * z1)
+    return datos
+
+
+def test_normal_escalar_reproduce_la_version_original():
+    original = _box_muller_original(GeneradorLCG(4321), 1.5, 2.3, 10_001)
+    escalar = GeneradorVariables(GeneradorLCG(4321), vectorizado=False).normal(1.5, 2.3, 10_001)
+    vectorizado = GeneradorVariables(GeneradorLCG(4321)).normal(1.5, 2.3, 10_001)
+    assert escalar == original
+    np.testing.assert_allclose(vectorizado, original, rtol=1e-14, atol=1e-14)
+
+
+def _valor_p_discreto(muestra, distribucion, cola=1e-3):
+    """Valor p chi-cuadrado de una muestra entera frente a una distribución de scipy (colas agrupadas)."""
+    muestra = np.asarray(muestra)
+    bajo, alto = int(distribucion.ppf(cola)), int(distribucion.ppf(1 - cola))
+    centro = np.arange(bajo + 1, alto)
+    observados = np.r_[np.sum(muestra <= bajo), [np.sum(muestra == k) for k in centro], np.sum(muestra >= alto)]
+    esperados = np.r_[distribucion.cdf(bajo), distribucion.pmf(centro), distribucion.sf(alto - 1)] * len(muestra)
+    return stats.chisquare(observados, esperados).pvalue
+
+
+@pytest.mark.parametrize("lam", [10, 50, 10_000])
+def test_poisson_ptrs_sigue_la_distribucion(lam):
+    vectorizado = GeneradorVariables(GeneradorLCG(3)).poisson(lam, 200_000)
+    escalar = GeneradorVariables(GeneradorLCG(3), vectorizado=False).poisson(lam, 20_000)
+    assert _valor_p_discreto(vectorizado, stats.poisson(lam)) > 0.01
+    assert _valor_p_discreto(escalar, stats.poisson(lam)) > 0.01
+    assert abs(np.mean(vectorizado) - lam) < 4 * math.sqrt(lam / 200_000)
+
+
+@pytest.mark.parametrize("vectorizado, n", [(True, 1_000_000), (False, 20_000)])
+def test_zigurat_sigue_la_distribucion(vectorizado, n):
+    variables = GeneradorVariables(GeneradorLCG(2), vectorizado=vectorizado)
+    assert stats.kstest(variables.normal(1, 2, n, metodo="ziggurat"), "norm", args=(1, 2)).pvalue > 0.01
+    assert stats.kstest(variables.exponencial(3, n, metodo="ziggurat"), "expon", args=(0, 1 / 3)).pvalue > 0.01
+
+
+def test_alias_reproduce_las_frecuencias():
+    probabilidades = np.array([0.5, 0.05, 0.2, 0.0, 0.25])
+    muestra = GeneradorVariables(GeneradorLCG(8)).discreta([10, 20, 30, 40, 50], probabilidades, 200_000)
+    conteos = np.array([np.sum(muestra == v) for v in (10, 20, 30, 50)])
+    assert np.sum(muestra == 40) == 0
+    assert stats.chisquare(conteos, probabilidades[probabilidades > 0] * len(muestra)).pvalue > 0.01
+
+
+def test_alias_por_lotes_no_cambia_la_muestra():
+    alias = MuestreadorAlias.desde_datos([1, 1, 2, 3, 3, 3])
+    assert np.array_equal(alias.muestrear(10_001, GeneradorLCG(4), lote=997),
+                          alias.muestrear(10_001, GeneradorLCG(4)))
+
+
+@pytest.mark.parametrize("formato", [f for f in ExportadorDatos.formatos_disponibles()
+                                     if f in ExportadorDatos.FORMATOS_BINARIOS])
+def test_exportar_cargar_y_regenerar(tmp_path, formato):
+    generador = GeneradorLCG(77)
+    metadatos = ExportadorDatos.metadatos("normal", (1, 2), 2500, generador, tamano_bloque=1000,
+                                          metodo="ziggurat")
+    bloques = GeneradorVariables(generador).bloques("normal", (1, 2), 2500, 1000, metodo="ziggurat")
+    destino = tmp_path / f"datos.{formato}"
+    ExportadorDatos.exportar_flujo(bloques, str(destino), formato, n=2500, metadatos=metadatos)
+    datos, cargados = ExportadorDatos.cargar_binario(str(destino))
+    assert cargados == metadatos
+    assert np.array_equal(datos, ExportadorDatos.regenerar(cargados))
+
+
+@pytest.mark.parametrize("contenido, esperado", [
+    (b"1 2 3 4 5\n", [1, 2, 3, 4, 5]),
+    (b"1 2\n3 4\n5 6\n", [1, 2, 3, 4, 5, 6]),
+    (b"valor\n1.5\n2.5\n", [1.5, 2.5]),
+    (b"1,10\n2,20\n", [1, 2]),
+])
+def test_ingesta_de_texto_lee_como_el_cargador_original(contenido, esperado):
+    datos, informe = IngestaDatos.cargar(io.BytesIO(contenido), "txt")
+    assert np.array_equal(datos, esperado) and informe["registros"] == len(esperado)
+
+
+def test_ingesta_rechaza_filas_incompletas():
+    with pytest.raises(ValueError):
+        IngestaDatos.cargar(io.BytesIO(b"1 2 3\n4 5\n"), "txt")
+
+
+def test_ks_bootstrap_no_depende_de_procesos():
+    datos = GeneradorVariables(GeneradorLCG(3)).normal(0, 1, 300)
+    _serie_y_paralelo(lambda g, p: PruebasAjuste.ks_bootstrap(datos, "normal", g, B=64, procesos=p))
+
+
+@pytest.mark.parametrize("estadistico", ["media", "desviacion", "mediana", np.ptp])
+def test_bootstrap_coincide_con_el_remuestreo_directo(estadistico):
+    datos = GeneradorVariables(GeneradorLCG(5)).exponencial(2, 257)
+    xs, n, B = np.sort(datos), len(datos), 50
+    u = GeneradorLCG(6).siguientes(B * n)
+    remuestras = xs[(u * n).astype(np.int64).reshape(B, n)]
+    directo = {"media": lambda r: r.mean(axis=1), "desviacion": lambda r: r.std(axis=1),
+               "mediana": lambda r: np.median(r, axis=1)}.get(estadistico, lambda r: np.ptp(r, axis=1))
+    np.testing.assert_allclose(Bootstrap.replicas(datos, estadistico, GeneradorLCG(6), B=B),
+                               directo(remuestras), rtol=1e-12)
+
+
+def test_bootstrap_no_depende_de_procesos():
+    datos = GeneradorVariables(GeneradorLCG(3)).normal(0, 1, 300)
+    _serie_y_paralelo(lambda g, p: Bootstrap.replicas(datos, "mediana", g, B=64, procesos=p))
+
+
+def test_evaluar_lote_elige_poisson_en_conteos():
+    variables = GeneradorVariables(GeneradorLCG(1))
+    conjuntos = {f"lambda={lam}": variables.poisson(lam, 2000) for lam in (0.3, 1, 4, 30)}
+    mejores = {f["conjunto"]: f for f in PruebasAjuste.evaluar_lote(conjuntos) if f["rango"] == 1}
+    assert set(mejores) == set(conjuntos)
+    assert all(f["familia"] == "poisson" and f["conforme"] for f in mejores.values())
+
+
+@pytest.mark.parametrize("dimension", [1, 2, 5])
+def test_secuencias_sin_aleatorizar_coinciden_con_scipy(dimension):
+    halton = SecuenciaHalton(dimension, aleatorizar=False).puntos(1000)
+    assert np.array_equal(halton, qmc.Halton(dimension, scramble=False).random(1000))
+    sobol = SecuenciaSobol(dimension, aleatorizar=False).puntos(1024)
+    assert np.array_equal(sobol, qmc.Sobol(dimension, scramble=False).random(1024))
+
+
+@pytest.mark.parametrize("clase", [SecuenciaHalton, SecuenciaSobol])
+def test_secuencia_por_tramos_coincide_con_un_solo_lote(clase):
+    referencia = clase(3, indice=3).puntos(2**17).ravel()
+    secuencia = clase(3, indice=3)
+    tramos = [secuencia.siguientes(3 * m) for m in (1, 5, 32768, 2**17 - 32774)]
+    assert np.array_equal(np.concatenate(tramos), referencia)
+    assert np.array_equal(clase(3).subflujo(3 + 2**16, 3).puntos(2**16).ravel(), referencia[3 * 2**16:])
+
+
+def test_sobol_con_desplazamiento_coincide_con_scipy():
+    esperado = qmc.Sobol(2, scramble=False)
+    esperado.fast_forward(3)
+    assert np.array_equal(SecuenciaSobol(2, aleatorizar=False, indice=3).puntos(2), esperado.random(2))
+    esperado = qmc.Sobol(2, scramble=False)
+    esperado.fast_forward(98_000)
+    secuencia = SecuenciaSobol(2, aleatorizar=False).saltar(2 * 98_000)
+    assert np.array_equal(np.concatenate([secuencia.puntos(32768) for _ in range(4)]), esperado.random(4 * 32768))
+
+
+def test_media_desviacion_por_bloques():
+    datos = GeneradorVariables(GeneradorLCG(9)).normal(1e6, 3, 10_001)
+    media, desviacion = PruebasAjuste.media_desviacion(datos, tamano=997)
+    assert media == pytest.approx(np.mean(datos), rel=1e-14)
+    assert desviacion == pytest.approx(np.std(datos), rel=1e-10)
+
+
+def test_simular_pi_no_depende_de_procesos_y_coincide_con_estimar_pi():
+    _serie_y_paralelo(lambda g, p: MonteCarlo.simular_pi(200_001, g, max_retenidos=999, procesos=p))
+    assert MonteCarlo.simular_pi(200_001, GeneradorLCG(7))["estimacion"] == MonteCarlo.estimar_pi(200_001, GeneradorLCG(7))
+
+
+def test_barrido_independiente_usa_tramos_consecutivos():
+    escalas, replicas = [100, 1000, 10_000], 4
+    generador = GeneradorLCG(7)
+    esperado = [[MonteCarlo.estimar_pi(n, generador) for _ in range(replicas)] for n in escalas]
+    barrido = MonteCarlo.barrido_precision(escalas, replicas, GeneradorLCG(7))
+    assert np.array_equal(barrido["estimaciones"], esperado)
+    _serie_y_paralelo(lambda g, p: MonteCarlo.barrido_precision(escalas, replicas, g, procesos=p))
+
+
+def test_barrido_anidado_lee_prefijos_de_una_corrida_por_replica():
+    escalas, replicas = [100, 1000, 10_000], 4
+    barrido = MonteCarlo.barrido_precision(escalas, replicas, GeneradorLCG(7), anidado=True)
+    esperado = [[MonteCarlo.estimar_pi(n, GeneradorLCG(7).subflujo(r * escalas[-1], 2)) for r in range(replicas)]
+                for n in escalas]
+    assert np.array_equal(barrido["estimaciones"], esperado)
+    _serie_y_paralelo(lambda g, p: MonteCarlo.barrido_precision(escalas, replicas, g, procesos=p, anidado=True))